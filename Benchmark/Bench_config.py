@@ -0,0 +1,43 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class DataConfig:
+    project_name: str = field(default="Benchmark")
+
+    # 每个基准测试的数据行数
+    sizes: list[int] = field(default_factory=lambda: [10_000, 100_000])
+
+    # 中心交件量的日数据文件个数
+    n_days: int = field(default=3)
+
+    # 需要测试的阶段
+    stages: list[str] = field(
+        default_factory=lambda: [
+            "excel_to_csv",
+            "datacvs_parquet",
+            "center_rooling",
+            "center_chunked",
+            "hq_report",
+            "import_time",
+        ]
+    )
+
+    # 测量导入耗时的模块, 每个模块在新的解释器中导入, 取多次中的最小值
+    import_modules: list[str] = field(default_factory=lambda: ["Package", "cli"])
+    import_repeat: int = field(default=5)
+
+    # Excel 单个工作表的最大数据行数(不含表头)
+    excel_max_rows: int = field(default=1_048_575)
+
+    # 网点个数和城市线路个数
+    n_outlets: int = field(default=500)
+    n_cities: int = field(default=300)
+
+    # 代码带字母前缀的网点个数
+    n_alpha_outlets: int = field(default=5)
+
+    # center_chunked 阶段每个文件分成的数据块个数
+    n_chunks: int = field(default=4)
+
+    results_dir: str = field(default="./benchmark_results")
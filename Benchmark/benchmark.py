@@ -0,0 +1,349 @@
+import sys
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import logging
+import pandas as pd
+
+from Benchmark.Bench_config import DataConfig
+from Benchmark.datagen import DataGenerator
+from CenterSubmission.centersubmission import CenterSubmission
+from HeadquartersDaily.HqDaily import HeadquartersDaily
+from Package.CsvConversion import ExcelToCsv
+from Package.DataConversion import DataCvs
+from Package.StageProfiler import PeakMemory
+
+
+class Benchmark:
+    """转换流程和报表流程的基准测试"""
+
+    config: DataConfig = DataConfig()
+
+    def __init__(self, seed: int = 0, work_dir: Path | None = None):
+        """初始化 Benchmark 类实例
+
+        Args:
+            seed (int, optional): 模拟数据的随机数种子. Defaults to 0.
+            work_dir (Path | None, optional): 模拟数据的存放文件夹, None 时使用临时文件夹. Defaults to None.
+        """
+
+        self.project_name: str = self.config.project_name
+        self.logger: logging.Logger = logging.getLogger(
+            f"{self.project_name}.{__name__}"
+        )
+        self.generator: DataGenerator = DataGenerator(seed)
+        self.work_dir: Path | None = work_dir
+        self.results: list[dict[str, Any]] = list()
+
+    def measure(
+        self, stage: str, rows: int, func: Callable[..., Any], *args, **kwargs
+    ) -> Any:
+        """运行一个阶段, 记录耗时, CPU时间和内存峰值
+
+        Args:
+            stage (str): 阶段名称
+            rows (int): 阶段处理的数据行数
+            func (Callable[..., Any]): 阶段函数
+
+        Returns:
+            Any: 阶段函数的返回值
+        """
+
+        with PeakMemory() as memory:
+            start_wall: float = time.perf_counter()
+            start_cpu: float = time.process_time()
+
+            result: Any = func(*args, **kwargs)
+
+            wall: float = time.perf_counter() - start_wall
+            cpu: float = time.process_time() - start_cpu
+
+        record: dict[str, Any] = {
+            "stage": stage,
+            "rows": rows,
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "peak_mb": memory.peak_mb,
+            "rows_per_s": round(rows / wall, 1) if wall else None,
+        }
+        self.results.append(record)
+        self.logger.info(
+            f"{stage} | 行数: {rows: ,} | 耗时: {wall:.2f}秒 | "
+            f"CPU: {cpu:.2f}秒 | 内存峰值: {record['peak_mb']}MB"
+        )
+
+        return result
+
+    def measure_import(self, module: str, repeat: int | None = None) -> float:
+        """在新的解释器中导入模块, 记录导入耗时, 用于防止启动时间变慢
+
+        Args:
+            module (str): 模块名称, 相对仓库根目录导入
+            repeat (int | None, optional): 重复次数, 取最小值, None 时使用配置值. Defaults to None.
+
+        Returns:
+            float: 导入耗时(秒)
+        """
+
+        repeat = repeat or self.config.import_repeat
+        code: str = (
+            "import sys, time, json\n"
+            "start = time.perf_counter()\n"
+            f"import {module}\n"
+            "wall = time.perf_counter() - start\n"
+            "print(json.dumps({'wall': wall, 'pandas': 'pandas' in sys.modules}))"
+        )
+
+        runs: list[dict[str, Any]] = list()
+        for _ in range(repeat):
+            res = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=Path(__file__).resolve().parent.parent,
+                capture_output=True,
+                text=True,
+            )
+            if res.returncode != 0:
+                self.logger.error(f"导入模块 '{module}' 失败: {res.stderr.strip()}")
+                raise RuntimeError()
+            runs.append(json.loads(res.stdout.strip().splitlines()[-1]))
+
+        wall: float = min(run["wall"] for run in runs)
+        record: dict[str, Any] = {
+            "stage": f"import_time:{module}",
+            "rows": 0,
+            "wall_s": round(wall, 4),
+            "cpu_s": None,
+            "peak_mb": None,
+            "rows_per_s": None,
+            "loads_pandas": runs[-1]["pandas"],
+        }
+        self.results.append(record)
+        self.logger.info(
+            f"import_time | 模块: {module} | 耗时: {wall * 1000:.1f}毫秒 | "
+            f"加载pandas: {'是' if record['loads_pandas'] else '否'}"
+        )
+
+        return wall
+
+    def run_size(self, rows: int, work_dir: Path, stages: list[str]) -> None:
+        """按指定数据量运行各阶段
+
+        Args:
+            rows (int): 每个文件的数据行数
+            work_dir (Path): 模拟数据的存放文件夹
+            stages (list[str]): 需要测试的阶段
+        """
+
+        n_days: int = self.config.n_days
+        size_dir: Path = work_dir / f"rows_{rows}"
+
+        if "excel_to_csv" in stages:
+            excel_rows: int = min(rows, self.config.excel_max_rows)
+            excel_dir: Path = size_dir / "excel"
+            self.generator.center_files(excel_dir, excel_rows, 1, excel=True)
+            output_dir: Path = size_dir / "excel_csv"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            exceltocsv = ExcelToCsv(project_name=self.project_name, cache=False)
+            self.measure(
+                "excel_to_csv",
+                excel_rows,
+                exceltocsv.convert_dir,
+                excel_dir,
+                output_dir,
+            )
+
+        if {"datacvs_parquet", "center_rooling", "center_chunked"} & set(stages):
+            csv_dir: Path = size_dir / "csv"
+            csv_list: list[Path] = self.generator.center_files(csv_dir, rows, n_days)
+
+            if "datacvs_parquet" in stages:
+                datacvs = DataCvs(project_name=self.project_name, cache=False)
+                self.measure(
+                    "datacvs_parquet",
+                    rows * n_days,
+                    datacvs.convert,
+                    csv_dir,
+                    dtype="csv",
+                    cvsdtype="parquet",
+                )
+
+            df_full: pd.DataFrame | None = None
+            if "center_rooling" in stages:
+                center = CenterSubmission()
+                df_full = self.measure(
+                    "center_rooling", rows * n_days, center.rooling_calculate, csv_list
+                )
+
+            if "center_chunked" in stages:
+                center = CenterSubmission(
+                    chunksize=max(rows // self.config.n_chunks, 1)
+                )
+                df_chunked: pd.DataFrame = self.measure(
+                    "center_chunked", rows * n_days, center.rooling_calculate, csv_list
+                )
+                if df_full is None:
+                    df_full = CenterSubmission().rooling_calculate(csv_list)
+                self.check_equal("center_chunked", df_full, df_chunked)
+
+        if "hq_report" in stages:
+            hq_rows: int = min(rows, self.config.excel_max_rows)
+            hq_list: list[Path] = self.generator.hq_files(size_dir / "hq", hq_rows)
+            hqdaily = HeadquartersDaily()
+            self.measure("hq_report", hq_rows, hqdaily.report_production, hq_list)
+
+    def check_equal(
+        self, stage: str, expected: pd.DataFrame, result: pd.DataFrame
+    ) -> None:
+        """检验优化后的流程与整表计算的结果相同, 不同时报错
+
+        Args:
+            stage (str): 阶段名称
+            expected (pd.DataFrame): 整表计算的结果
+            result (pd.DataFrame): 需要检验的结果
+        """
+
+        try:
+            pd.testing.assert_frame_equal(
+                expected.reset_index(drop=True), result.reset_index(drop=True)
+            )
+        except AssertionError as e:
+            self.logger.error(f"{stage} 的结果与整表计算不同: {e}")
+            raise ValueError()
+
+        self.logger.info(f"{stage} 的结果与整表计算相同: {len(result): ,} 行")
+
+    def run(
+        self, sizes: list[int] | None = None, stages: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """运行基准测试
+
+        Args:
+            sizes (list[int] | None, optional): 数据行数, None 时使用配置值. Defaults to None.
+            stages (list[str] | None, optional): 需要测试的阶段, None 时使用配置值. Defaults to None.
+
+        Returns:
+            list[dict[str, Any]]: 每个阶段的测试结果
+        """
+
+        sizes = sizes or self.config.sizes
+        stages = stages or self.config.stages
+
+        unknown: set[str] = set(stages) - set(self.config.stages)
+        if unknown:
+            self.logger.error(f"没有这些测试阶段: {sorted(unknown)}")
+            raise ValueError()
+
+        self.logger.info(f"--基准测试开始-- 数据量: {sizes} | 阶段: {stages}")
+
+        # 导入耗时与数据量无关, 只测量一次
+        if "import_time" in stages:
+            for module in self.config.import_modules:
+                self.measure_import(module)
+
+        if self.work_dir is None:
+            with tempfile.TemporaryDirectory(prefix="benchmark_") as tmp:
+                for rows in sizes:
+                    self.run_size(rows, Path(tmp), stages)
+        else:
+            for rows in sizes:
+                self.run_size(rows, self.work_dir, stages)
+
+        self.logger.info("--基准测试结束--")
+
+        return self.results
+
+    @staticmethod
+    def environment() -> dict[str, Any]:
+        """运行环境信息, 用于对比不同版本的结果"""
+
+        try:
+            commit: str | None = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=Path(__file__).resolve().parent,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {
+            "commit": commit,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def save(self, path: Path) -> Path:
+        """将测试结果写入 json 文件
+
+        Args:
+            path (Path): 结果文件路径
+
+        Returns:
+            Path: 结果文件路径
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"environment": self.environment(), "results": self.results},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+        self.logger.info(f"测试结果已保存: {path}")
+
+        return path
+
+    @staticmethod
+    def compare(base_path: Path, new_path: Path) -> pd.DataFrame:
+        """对比两个结果文件, 比值小于 1 表示新版本更快/更省内存
+
+        Args:
+            base_path (Path): 基准版本的结果文件
+            new_path (Path): 新版本的结果文件
+
+        Returns:
+            pd.DataFrame: 各阶段耗时和内存峰值的对比表
+        """
+
+        frames: list[pd.DataFrame] = list()
+        for path in [base_path, new_path]:
+            with open(path, "r", encoding="utf-8") as f:
+                frames.append(pd.DataFrame(json.load(f)["results"]))
+
+        df = pd.merge(
+            frames[0],
+            frames[1],
+            how="outer",
+            on=["stage", "rows"],
+            suffixes=("_base", "_new"),
+        )
+        df["wall_ratio"] = (df["wall_s_new"] / df["wall_s_base"]).round(3)
+        df["peak_ratio"] = (df["peak_mb_new"] / df["peak_mb_base"]).round(3)
+
+        return df.loc[
+            :,
+            [
+                "stage",
+                "rows",
+                "wall_s_base",
+                "wall_s_new",
+                "wall_ratio",
+                "peak_mb_base",
+                "peak_mb_new",
+                "peak_ratio",
+            ],
+        ]
@@ -0,0 +1,251 @@
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import logging
+import numpy as np
+import pandas as pd
+
+from Benchmark.Bench_config import DataConfig
+from CenterSubmission.CenterS_config import DataConfig as CenterConfig
+from HeadquartersDaily.HqDaily_config import DataConfig as HqConfig
+from Package.ExcelExport import ExcelExport
+
+
+class DataGenerator:
+    """生成与各报表列结构一致的模拟数据"""
+
+    config: DataConfig = DataConfig()
+    center_config: CenterConfig = CenterConfig()
+    hq_config: HqConfig = HqConfig()
+
+    def __init__(self, seed: int = 0):
+        """初始化 DataGenerator 类实例
+
+        Args:
+            seed (int, optional): 随机数种子, 相同的种子生成相同的数据. Defaults to 0.
+        """
+
+        self.project_name: str = self.config.project_name
+        self.logger: logging.Logger = logging.getLogger(
+            f"{self.project_name}.{__name__}"
+        )
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+    def center_frame(
+        self, rows: int, day: date, alpha_codes: bool = False
+    ) -> pd.DataFrame:
+        """生成单日中心交件数据, 除需要的列外附带若干无关列, 与实际导出文件相近
+
+        Args:
+            rows (int): 行数
+            day (date): 数据日期
+            alpha_codes (bool, optional): 后半部分行中是否混入字母数字网点代码, 分块读取时前面的数据块只有数字代码. Defaults to False.
+
+        Returns:
+            pd.DataFrame: 单日中心交件数据
+        """
+
+        code: np.ndarray = self.rng.integers(0, self.config.n_outlets, rows)
+        code_text: pd.Series = pd.Series(code + 971_000)
+        if alpha_codes:
+            # 新开网点的代码带字母前缀, 只出现在文件的后半部分
+            mask: np.ndarray = (np.arange(rows) >= rows // 2) & (
+                code < self.config.n_alpha_outlets
+            )
+            code_text = code_text.astype(str).mask(mask, "A" + code_text.astype(str))
+        second: np.ndarray = self.rng.integers(0, 24 * 3600, rows)
+        submit = pd.Series(
+            pd.Timestamp(day) + pd.to_timedelta(second, unit="s")
+        ).astype(str)
+        # 约 1% 的交件时间为空
+        submit[self.rng.random(rows) < 0.01] = None
+
+        col_code, col_name, col_time, col_delay = self.center_config.col_need
+        return pd.DataFrame(
+            {
+                "运单号": np.arange(rows, dtype=np.int64) + 7_000_000_000_000,
+                col_code: code_text,
+                col_name: pd.Series(code).map(lambda c: f"西宁{c:03d}网点"),
+                "寄件省份": self.rng.choice(["青海省", "甘肃省", "四川省"], rows),
+                "揽收时间": submit,
+                col_time: submit,
+                "重量": self.rng.gamma(2.0, 0.8, rows).round(2),
+                "派件网点": self.rng.choice(["城东", "城西", "城北", "城中"], rows),
+                col_delay: (self.rng.random(rows) < 0.08).astype(np.int8),
+                "备注": "",
+            }
+        )
+
+    def cityroute_frame(self, rows: int, day: date) -> pd.DataFrame:
+        """生成城市线路汇总数据
+
+        Args:
+            rows (int): 城市线路条数
+            day (date): 数据日期
+
+        Returns:
+            pd.DataFrame: 城市线路汇总数据
+        """
+
+        # 每条线路(始发城市, 目的城市)只出现一次, 与真实汇总表一样 日期 + 线路 唯一;
+        # 线路数超过城市两两组合数时增加城市数
+        n_cities: int = max(
+            self.config.n_cities, int(np.ceil((1 + np.sqrt(1 + 4 * rows)) / 2))
+        )
+        pair: np.ndarray = self.rng.choice(
+            n_cities * (n_cities - 1), rows, replace=False
+        )
+        origin: np.ndarray = pair // (n_cities - 1)
+        target: np.ndarray = (origin + 1 + pair % (n_cities - 1)) % n_cities
+
+        col_ratio: list[str] = self.hq_config.cal_col_1[2:]
+        col_amount: list[str] = self.hq_config.cal_col_2[2:]
+        amount: np.ndarray = self.rng.integers(0, 400, (rows, len(col_amount))).astype(
+            float
+        )
+        ratio: np.ndarray = (
+            amount / (amount.sum(axis=1, keepdims=True) + 1) * 100
+        ).round(2)
+
+        df = pd.DataFrame(
+            {
+                "日期": day.strftime("%Y-%m-%d"),
+                "城市线路名称": [
+                    f"城市{o:03d}-城市{t:03d}" for o, t in zip(origin, target)
+                ],
+            }
+        )
+        df[col_ratio] = ratio
+        df[col_amount] = amount
+        df["与第一差值(%)"] = (self.rng.random(rows) * 10).round(2)
+        df["未达成量"] = self.rng.integers(0, 2_000, rows)
+
+        return df
+
+    def gpt_frames(self, cityroute: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """根据城市线路汇总数据生成GPT文件的 改善方案 和 GPT 两个工作表
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: 改善方案表, GPT表
+        """
+
+        routes: pd.Series = cityroute["城市线路名称"].drop_duplicates()
+        plan_routes = routes.sample(frac=0.3, random_state=0)
+        stage: list[str] = ["路由", "交件", "出港", "运输", "进港", "派签"]
+
+        gpt1 = pd.DataFrame(
+            {
+                "GPT展示日期": cityroute["日期"].iloc[0],
+                "线路名称": plan_routes.to_numpy(),
+                "与第一差值": (self.rng.random(len(plan_routes)) * 10).round(2),
+                "未达成量": self.rng.integers(0, 2_000, len(plan_routes)),
+                "核心影响环节": self.rng.choice(stage, len(plan_routes)),
+                "延误量": self.rng.integers(0, 400, len(plan_routes)),
+                "延误占比": self.rng.random(len(plan_routes)).round(4),
+                "主要点位": np.where(
+                    self.rng.random(len(plan_routes)) < 0.7, "点位", None
+                ),
+                "改善举措": "优化班次",
+                "责任部门": "运营部",
+                "责任人": "张三",
+                "完成日期": cityroute["日期"].iloc[0],
+                "备注": None,
+            }
+        ).loc[:, self.hq_config.gpt_col]
+        gpt2 = pd.DataFrame({"城市线路": routes.sample(frac=0.5, random_state=1)})
+
+        return gpt1, gpt2
+
+    def write_excel(self, df: pd.DataFrame, path: Path) -> Path:
+        """以只写模式写入xlsx文件, 超过Excel行数上限的部分截断
+
+        Args:
+            df (pd.DataFrame): 数据表
+            path (Path): 文件路径
+
+        Returns:
+            Path: 文件路径
+        """
+
+        if len(df) > self.config.excel_max_rows:
+            self.logger.warning(
+                f"'{path.name}' 超过Excel行数上限, 只写入前 {self.config.excel_max_rows: ,} 行"
+            )
+            df = df.iloc[: self.config.excel_max_rows]
+
+        return ExcelExport(self.project_name).to_excel(df, path)
+
+    def write_gpt(self, gpt1: pd.DataFrame, gpt2: pd.DataFrame, path: Path) -> Path:
+        """写入GPT文件, 表头位置与实际文件一致"""
+
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            pd.DataFrame([["改善方案"]]).to_excel(
+                writer, sheet_name="改善方案", index=False, header=False
+            )
+            gpt1.to_excel(writer, sheet_name="改善方案", index=False, startrow=1)
+            pd.concat(
+                [pd.DataFrame({"城市线路": ["说明", "说明"]}), gpt2], ignore_index=True
+            ).to_excel(writer, sheet_name="GPT", index=False)
+
+        return path
+
+    def center_files(
+        self, output_dir: Path, rows: int, n_days: int, excel: bool = False
+    ) -> list[Path]:
+        """生成多日中心交件数据文件
+
+        Args:
+            output_dir (Path): 保存的文件夹
+            rows (int): 每日行数
+            n_days (int): 天数
+            excel (bool, optional): 是否生成xlsx文件, 否则生成csv文件. Defaults to False.
+
+        Returns:
+            list[Path]: 文件路径
+        """
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        start: date = date(2026, 1, 1)
+        path_list: list[Path] = list()
+        for i in range(n_days):
+            day: date = start + timedelta(days=i)
+            # 第一天只有数字代码, 之后各天混入字母数字代码, 各文件的代码类型不同
+            df: pd.DataFrame = self.center_frame(rows, day, alpha_codes=i > 0)
+            if excel:
+                path = output_dir / f"中心交件明细_{day:%Y%m%d}.xlsx"
+                self.write_excel(df, path)
+            else:
+                path = output_dir / f"中心交件明细_{day:%Y%m%d}.csv"
+                df.to_csv(path, index=False)
+            path_list.append(path)
+
+        self.logger.info(f"生成 {n_days} 个中心交件文件, 每个 {rows: ,} 行")
+
+        return path_list
+
+    def hq_files(self, output_dir: Path, rows: int) -> list[Path]:
+        """生成总部日报的 城市线路汇总 和 GPT 文件
+
+        Args:
+            output_dir (Path): 保存的文件夹
+            rows (int): 城市线路条数
+
+        Returns:
+            list[Path]: 文件路径
+        """
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        cityroute: pd.DataFrame = self.cityroute_frame(rows, date(2026, 1, 1))
+        gpt1, gpt2 = self.gpt_frames(cityroute)
+
+        path_list: list[Path] = [
+            self.write_excel(cityroute, output_dir / "城市线路汇总.xlsx"),
+            self.write_gpt(gpt1, gpt2, output_dir / "GPT日报.xlsx"),
+        ]
+
+        self.logger.info(f"生成总部日报文件, 城市线路 {rows: ,} 条")
+
+        return path_list
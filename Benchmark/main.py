@@ -0,0 +1,69 @@
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import logging
+from datetime import datetime
+
+from Benchmark.Bench_config import DataConfig
+from Benchmark.benchmark import Benchmark
+from Package.LogConfig import LogConfig
+
+
+def parse_args() -> argparse.Namespace:
+    config: DataConfig = DataConfig()
+
+    parser = argparse.ArgumentParser(description="转换流程和报表流程的基准测试")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=config.sizes, help="每个文件的数据行数"
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        default=config.stages,
+        choices=config.stages,
+        help="需要测试的阶段",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="模拟数据的随机数种子")
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help="模拟数据的存放文件夹, 默认使用临时文件夹",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="结果文件路径")
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        nargs=2,
+        metavar=("BASE", "NEW"),
+        help="对比两个结果文件",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    config: DataConfig = DataConfig()
+    args: argparse.Namespace = parse_args()
+
+    logconfig: LogConfig = LogConfig(config.project_name)
+    logger: logging.Logger = logconfig.setup_logger()
+
+    if args.compare:
+        print(Benchmark.compare(*args.compare).to_string(index=False))
+        sys.exit(0)
+
+    logger.info("--程序启动--")
+
+    benchmark: Benchmark = Benchmark(seed=args.seed, work_dir=args.work_dir)
+    benchmark.run(sizes=args.sizes, stages=args.stages)
+
+    output: Path = args.output or (
+        Path(config.results_dir) / f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    benchmark.save(output)
+
+    logger.info("--程序结束--")
@@ -9,4 +9,25 @@ class DataConfig():
         "0:及时,1延误"
     ])
     
+    # 读取时直接指定的列类型, 避免解析后再转换
+    col_dtype: dict[str, str] = field(default_factory=lambda: {
+        "揽收网点代码": "category",
+        "揽收网点名称": "category",
+        "0:及时,1延误": "Int8"
+    })
+    
+    # 读取时直接解析的时间列
+    col_date: list[str] = field(default_factory=lambda: [
+        "实际交件时间"
+    ])
+    
+    # csv解析引擎, 可选的值有: "c", "pyarrow"
+    csv_engine: str = field(default="c")
+
+    # 串行计算时预读后续文件的内存上限(MB), 0 为不预读
+    prefetch_mb: int = field(default=256)
+    
+    # 单日表缓存的总大小上限(MB), 超过时删除最久未使用的缓存
+    cache_max_mb: int = field(default=2048)
+    
     project_name: str = field(default="CenterSubmission")
\ No newline at end of file
@@ -1,15 +1,31 @@
+import io
+import os
 import sys
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
 from pathlib import Path
-from typing import cast
+from typing import TYPE_CHECKING, Iterator, cast
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 import pandas as pd
 import logging
 
-from CenterS_config import DataConfig
+from CenterSubmission.CenterS_config import DataConfig
+from Package.AggregateState import AggregateState
+from Package.ConversionManifest import ConversionManifest
 from Package.CsvConversion import ExcelToCsv
+from Package.DtypeOptimize import DtypeOptimize
 from Package.FilePathReading import PathReading
+from Package.FilePrefetch import FilePrefetcher
+from Package.FrameCache import FrameCache
+from Package.LogConfig import LogConfig
+from Package.StageProfiler import StageProfiler
+from Package.TimeParsing import TimeParsing
+
+if TYPE_CHECKING:
+    from Package.ParquetStore import ParquetStore
 
 
 class CenterSubmission:
@@ -17,13 +33,73 @@ class CenterSubmission:
 
     config = DataConfig()
 
-    def __init__(self):
-        """初始化 CenterSubmission 类实例"""
+    def __init__(
+        self,
+        engine: str | None = None,
+        workers: int = 1,
+        chunksize: int | None = None,
+        prefetch_mb: int | None = None,
+        cache_dir: Path | None = None,
+    ):
+        """初始化 CenterSubmission 类实例
+
+        Args:
+            engine (str | None, optional): csv解析引擎, 可选的值有: "c", "pyarrow". Defaults to None(使用配置值).
+            workers (int, optional): 并行计算单日表的进程数, 1 为串行, 0 为CPU核数. Defaults to 1.
+            chunksize (int | None, optional): 分块读取的行数, 设置后内存占用只与网点数和时段数有关. Defaults to None(整个文件一次读取).
+            prefetch_mb (int | None, optional): 串行计算时预读后续文件的内存上限(MB), 0 为不预读. Defaults to None(使用配置值).
+            cache_dir (Path | None, optional): 单日表的缓存文件夹, 文件未变化时直接读取缓存. Defaults to None(不缓存).
+        """
 
         self.project_name: str = self.config.project_name
         self.logger: logging.Logger = logging.getLogger(
             f"{self.project_name}.{__name__}"
         )
+        self.engine: str = self.__verify_engine(engine or self.config.csv_engine)
+        self.workers: int = self.__verify_workers(workers)
+        self.chunksize: int | None = self.__verify_chunksize(chunksize)
+        self.prefetch_mb: int = (
+            self.config.prefetch_mb if prefetch_mb is None else prefetch_mb
+        )
+        self.cache: FrameCache | None = (
+            FrameCache(cache_dir, self.config.cache_max_mb * 1024**2, self.project_name)
+            if cache_dir is not None
+            else None
+        )
+
+    def __verify_engine(self, engine: str) -> str:
+        """检验csv解析引擎是否可用, pyarrow 未安装时退回 c 引擎"""
+
+        engine_list: list[str] = ["c", "pyarrow"]
+        if engine not in engine_list:
+            self.logger.error(
+                f"engine参数没有 {engine} 值, engine参数有: 'c', 'pyarrow'"
+            )
+            raise ValueError()
+
+        if engine == "pyarrow" and importlib.util.find_spec("pyarrow") is None:
+            self.logger.warning("未安装 pyarrow, 使用 c 引擎解析csv文件")
+            return "c"
+
+        return engine
+
+    def __verify_workers(self, workers: int) -> int:
+        """检验并行进程数是否正确"""
+
+        if not isinstance(workers, int) or workers < 0:
+            self.logger.error(f"workers参数必须为非负整数, 当前为: {workers}")
+            raise ValueError()
+
+        return workers or os.cpu_count() or 1
+
+    def __verify_chunksize(self, chunksize: int | None) -> int | None:
+        """检验分块行数是否正确"""
+
+        if chunksize is not None and (not isinstance(chunksize, int) or chunksize <= 0):
+            self.logger.error(f"chunksize参数必须为正整数, 当前为: {chunksize}")
+            raise ValueError()
+
+        return chunksize
 
     def path_read(self, conversion: int = 1) -> Path | list[Path] | None:
         """读取数据文件
@@ -42,7 +118,9 @@ class CenterSubmission:
             raise ValueError()
 
         if conversion == 1:
-            exceltocsv: ExcelToCsv = ExcelToCsv(project_name=self.project_name)
+            exceltocsv: ExcelToCsv = ExcelToCsv(
+                project_name=self.project_name, workers=self.workers
+            )
             csv_path: Path | list[Path] | None = exceltocsv.operation()
 
         elif conversion == 0:
@@ -51,11 +129,75 @@ class CenterSubmission:
 
         return csv_path
 
-    def single_calculate(self, path: Path) -> pd.DataFrame:
+    def read_data(self, path: Path, source: io.BytesIO | None = None) -> pd.DataFrame:
+        """只读取需要的列, 并在解析时直接指定列类型
+
+        Args:
+            path (Path): 单日数据文件路径
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
+
+        Returns:
+            pd.DataFrame: 需要的列组成的数据表
+        """
+
+        df: pd.DataFrame = pd.read_csv(
+            source if source is not None else path,
+            usecols=self.config.col_need,
+            dtype=self.config.col_dtype,
+            parse_dates=self.config.col_date,
+            engine=self.engine,
+        )
+
+        # 未在 col_dtype 中指定类型的列读取后再压缩
+        return DtypeOptimize(self.project_name).optimize(self.__restore_categories(df))
+
+    def read_chunks(
+        self, path: Path, source: io.BytesIO | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """按 chunksize 分块读取需要的列, 每次只有一个数据块在内存中
+
+        Args:
+            path (Path): 单日数据文件路径
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
+
+        Yields:
+            Iterator[pd.DataFrame]: 需要的列组成的数据块
+        """
+
+        # pyarrow 引擎不支持分块读取
+        with pd.read_csv(
+            source if source is not None else path,
+            usecols=self.config.col_need,
+            dtype=self.config.col_dtype,
+            parse_dates=self.config.col_date,
+            engine="c",
+            chunksize=self.chunksize,
+        ) as reader:
+            for chunk in reader:
+                yield self.__restore_categories(chunk)
+
+    def __restore_categories(self, df: pd.DataFrame) -> pd.DataFrame:
+        """类别统一为字符串
+
+        pyarrow 引擎会把全为数字的代码读取为数字类别. 类别类型如果按数据块或文件分别推断,
+        同一网点会得到 100 和 "100" 两个键, 累加时不能对齐, 因此与 c 引擎一样统一为字符串.
+        """
+
+        for col in df.select_dtypes(include="category").columns:
+            categories: pd.Index = df[col].cat.categories
+            if categories.dtype != object:
+                df[col] = df[col].cat.rename_categories(categories.astype(str))
+
+        return df.loc[:, self.config.col_need]
+
+    def single_calculate(
+        self, path: Path, source: io.BytesIO | None = None
+    ) -> pd.DataFrame:
         """计算单日各分公司各时段交件量
 
         Args:
             path (Path): 单日数据文件路径
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
 
         Returns:
             pd.DataFrame: 单日计算表格
@@ -63,57 +205,143 @@ class CenterSubmission:
 
         self.logger.info(f"-正在计算 '{path.name}' ")
 
-        col_need: list[str] = self.config.col_need
-        df: pd.DataFrame = pd.read_csv(path)
-        df = df.loc[:, col_need]
+        with StageProfiler(f"计算 '{path.name}'", self.project_name) as prof:
+            if self.chunksize is None:
+                df: pd.DataFrame = self.read_data(path, source)
+                prof.rows_in = len(df)
+                df_pivot: pd.DataFrame = self.frame_calculate(df)
+            else:
+                df_pivot = self.chunk_calculate(path, source)
+            prof.rows_out = len(df_pivot)
+
+        self.logger.info(f"-'{path.name}' 计算完成")
+
+        return df_pivot
+
+    def frame_calculate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """按日期计算各分公司各时段交件量
+
+        Args:
+            df (pd.DataFrame): 包含 col_need 列的数据表
+
+        Returns:
+            pd.DataFrame: 按网点和日期汇总的计算表格
+        """
+
+        return self.__pivot(self.__counts(df))
+
+    def chunk_calculate(
+        self, path: Path, source: io.BytesIO | None = None
+    ) -> pd.DataFrame:
+        """分块读取单日数据, 累加各数据块的交件量和延误量, 结果与 frame_calculate 相同
+
+        Args:
+            path (Path): 单日数据文件路径
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
+
+        Returns:
+            pd.DataFrame: 按网点和日期汇总的计算表格
+        """
+
+        return self.__pivot(self.path_counts(path, source))
+
+    def path_counts(self, path: Path, source: io.BytesIO | None = None) -> pd.DataFrame:
+        """计算单日数据文件的计数表, 设置 chunksize 时分块读取并累加
+
+        Args:
+            path (Path): 单日数据文件路径
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
+
+        Returns:
+            pd.DataFrame: 以 揽收网点代码, 揽收网点名称, 实际交件日期, 实际交件时段 为索引的计数表
+        """
+
+        if self.chunksize is None:
+            return self.__counts(self.read_data(path, source), plain=True)
+
+        df_counts: pd.DataFrame | None = None
+        n_chunks: int = 0
+        for chunk in self.read_chunks(path, source):
+            df_counts = self.__reduce(df_counts, self.__counts(chunk, plain=True))
+            n_chunks += 1
+
+        if df_counts is None:
+            self.logger.error(f"'{path.name}' 中没有数据")
+            raise ValueError()
+
+        self.logger.info(f"-'{path.name}' 共 {n_chunks} 个数据块")
+
+        # 累加时未对齐的位置会变为浮点数, 计数还原为整数
+        return df_counts.astype("int64")
+
+    def __counts(self, df: pd.DataFrame, plain: bool = False) -> pd.DataFrame:
+        """按网点, 日期和时段计数交件量和延误量
+
+        Args:
+            df (pd.DataFrame): 包含 col_need 列的数据表
+            plain (bool, optional): 是否将类别列还原为普通列, 便于累加各数据块. Defaults to False.
+
+        Returns:
+            pd.DataFrame: 以 揽收网点代码, 揽收网点名称, 实际交件日期, 实际交件时段 为索引的计数表
+        """
 
         # --数据预处理--
-        df_process = df.copy()
+        df_process: pd.DataFrame = df.loc[:, self.config.col_need]
         # 去除空值
         df_process = df_process.dropna(subset=["实际交件时间"])
-        # 转换时间格式
-        df_process["实际交件时间"] = pd.to_datetime(
-            df_process["实际交件时间"], format="mixed"
+        # 读取时未能按统一格式解析的时间列, 按主要格式批量解析
+        df_process["实际交件时间"] = TimeParsing(self.project_name).parse(
+            df_process["实际交件时间"]
+        )
+        # 日期作为类别列分组, 只对不重复的日期生成 date 对象
+        df_process["实际交件日期"] = (
+            df_process["实际交件时间"]
+            .dt.normalize()  # type: ignore
+            .astype("category")
+            .cat.rename_categories(lambda t: t.date())
         )
-        df_process["实际交件日期"] = df_process["实际交件时间"].dt.date  # type: ignore
-        df_process["实际交件时段"] = df_process["实际交件时间"].dt.hour  # type: ignore
+        hour: pd.Series = df_process["实际交件时间"].dt.hour  # type: ignore
+        df_process["实际交件时段"] = hour.astype("int8")
+        df_process["延误"] = (df_process["0:及时,1延误"] == 1).fillna(False)
 
-        # --计算各时段交件量--
+        # --计算各时段交件量和延误量--
         col_group: list[str] = [
             "揽收网点代码",
             "揽收网点名称",
             "实际交件日期",
             "实际交件时段",
         ]
-        df_group = df_process.groupby(col_group).size().rename("交件量").reset_index()
-        df_group = df_group.sort_values(by=col_group, ascending=True)
-        df_pivot = df_group.pivot(
-            index=["揽收网点代码", "揽收网点名称", "实际交件日期"],
-            columns="实际交件时段",
-            values="交件量",
+        df_counts: pd.DataFrame = (
+            df_process.groupby(col_group, observed=True)
+            .agg(交件量=("实际交件时段", "size"), 延误量=("延误", "sum"))
+            .astype("int64")
+        )
+        if plain:
+            df_counts = self.__to_partial(df_counts.reset_index(), col_group)
+
+        return df_counts
+
+    @staticmethod
+    def __pivot(df_counts: pd.DataFrame) -> pd.DataFrame:
+        """由计数表得到各时段交件量, 单日总量和单日延误量"""
+
+        col_key: list[str] = ["揽收网点代码", "揽收网点名称", "实际交件日期"]
+
+        df_pivot: pd.DataFrame = (
+            df_counts["交件量"].sort_index().unstack("实际交件时段")
         )
 
         # --计算交件总量--
         df_pivot["单日总量"] = df_pivot.sum(axis=1, numeric_only=True)
 
-        # --计算延误量--
-        df_delay = df_process[df_process["0:及时,1延误"] == 1]
-        df_delay = (
-            df_delay.groupby(["揽收网点代码", "揽收网点名称", "实际交件日期"])
-            .size()
-            .rename("单日延误量")
-            .reset_index()
+        # --计算延误量, 没有延误的网点为空值--
+        df_delay: pd.Series = (
+            df_counts["延误量"].groupby(level=col_key, observed=True).sum()
         )
+        df_delay = df_delay.loc[df_delay > 0].rename("单日延误量").reset_index()
 
         # --两表进行连接--
-        df_pivot = pd.merge(
-            df_pivot,
-            df_delay,
-            how="left",
-            on=["揽收网点代码", "揽收网点名称", "实际交件日期"],
-        )
-
-        self.logger.info(f"-'{path.name}' 计算完成")
+        df_pivot = pd.merge(df_pivot, df_delay, how="left", on=col_key)
 
         return df_pivot
 
@@ -129,31 +357,284 @@ class CenterSubmission:
 
         self.logger.info("-单日数据汇总-开始-")
 
-        # 滚动计算单日表
-        df_list: list[pd.DataFrame] = list()
+        # map: 计算单日表; reduce: 每得到一张单日表就累加进多日表, 不保留中间结果
+        df_multi: pd.DataFrame | None = None
+
+        # 已缓存的单日表直接累加, 只计算新增或变化的文件
+        keys: dict[Path, str] = dict()
+        if self.cache is not None:
+            df_multi, csv_list, keys = self.__read_cache(csv_list)
+
+        if self.workers == 1 or len(csv_list) <= 1:
+            # 计算当前文件时后台预读后续文件
+            with FilePrefetcher(
+                csv_list, self.prefetch_mb * 1024**2, self.project_name
+            ) as prefetcher:
+                for p, source in prefetcher:
+                    df_single = self.partial_calculate(p, source)
+                    self.__write_cache(keys, p, df_single)
+                    df_multi = self.__reduce(df_multi, df_single)
+
+        else:
+            workers: int = min(self.workers, len(csv_list))
+            self.logger.info(f"使用 {workers} 个进程并行计算 {len(csv_list)} 个文件.")
+
+            with ProcessPoolExecutor(
+                max_workers=workers, **LogConfig.pool_kwargs(self.project_name)
+            ) as executor:
+                # 先提交大文件, 避免最后只剩一个大文件在计算; 累加结果与顺序无关
+                futures = {
+                    executor.submit(
+                        _partial_calculate_worker, p, self.engine, self.chunksize
+                    ): p
+                    for p in sorted(
+                        csv_list, key=lambda p: p.stat().st_size, reverse=True
+                    )
+                }
+                for future in as_completed(futures):
+                    df_single = future.result()
+                    self.__write_cache(keys, futures[future], df_single)
+                    df_multi = self.__reduce(df_multi, df_single)
+
+        if df_multi is None:
+            self.logger.error("没有可汇总的单日数据")
+            raise ValueError()
+
+        with StageProfiler(
+            "汇总多日表", self.project_name, rows_in=len(df_multi)
+        ) as prof:
+            df_multi = self.__summary(df_multi)
+            prof.rows_out = len(df_multi)
+
+        self.logger.info("-单日数据汇总-结束-")
+
+        return df_multi
+
+    def __read_cache(
+        self, csv_list: list[Path]
+    ) -> tuple[pd.DataFrame | None, list[Path], dict[Path, str]]:
+        """读取已缓存的单日表并累加
+
+        缓存键由文件的路径, 大小, 修改时间, 配置和计算代码的版本组成, 任一项变化时重新计算.
+
+        Args:
+            csv_list (list[Path]): 文件数据路径
+
+        Returns:
+            tuple[pd.DataFrame | None, list[Path], dict[Path, str]]: 缓存单日表累加的结果, 需要计算的文件, 需要计算的文件的缓存键
+        """
+
+        cache: FrameCache = cast(FrameCache, self.cache)
+        version: str = FrameCache.code_version(
+            CenterSubmission, DtypeOptimize, TimeParsing
+        )
+
+        df_multi: pd.DataFrame | None = None
+        missing: dict[Path, str] = dict()
         for p in csv_list:
-            df_single = self.single_calculate(p)
-            df_list.append(df_single)
+            key: str = cache.key("partial", p, repr(self.config), version)
+            df_single: pd.DataFrame | None = cache.get(key)
+            if df_single is None:
+                missing[p] = key
+            else:
+                df_multi = self.__reduce(df_multi, df_single)
+
+        self.logger.info(
+            f"{len(csv_list) - len(missing)} 个文件读取缓存, {len(missing)} 个文件需要计算"
+        )
 
-        # 将单日表汇总成多日表
-        df_multi = pd.concat(
-            df_list, axis=0, join="outer", ignore_index=True, sort=True
+        return df_multi, list(missing), missing
+
+    def __write_cache(
+        self, keys: dict[Path, str], path: Path, df_single: pd.DataFrame
+    ) -> None:
+        """设置了缓存文件夹时写入单日表的缓存"""
+
+        if self.cache is not None:
+            self.cache.put(keys[path], df_single)
+
+    def store_calculate(
+        self,
+        store: "ParquetStore",
+        start: date | None = None,
+        end: date | None = None,
+    ) -> pd.DataFrame:
+        """从 Parquet 数据仓库读取指定日期的数据计算多日表, 只读取需要的列和日期分区
+
+        Args:
+            store (ParquetStore): 数据仓库
+            start (date | None, optional): 开始日期(包含). Defaults to None.
+            end (date | None, optional): 结束日期(包含). Defaults to None.
+
+        Returns:
+            pd.DataFrame: 中心多日计算表格
+        """
+
+        self.logger.info("-数据仓库汇总-开始-")
+
+        df: pd.DataFrame = store.query(
+            self.project_name, columns=self.config.col_need, start=start, end=end
+        )
+        df_multi: pd.DataFrame = self.__summary(
+            self.__to_partial(self.frame_calculate(df))
         )
+
+        self.logger.info("-数据仓库汇总-结束-")
+
+        return df_multi
+
+    def incremental_calculate(
+        self,
+        state_dir: Path,
+        csv_list: list[Path],
+        window_days: int | None = None,
+    ) -> pd.DataFrame:
+        """增量计算多日表: 只解析新增或变化的文件, 合并进保存的计数状态
+
+        计数状态按文件的绝对路径保存(与转换清单相同), 不同文件夹中的同名文件分别计数,
+        更正后的文件重新写入时替换该文件原有的计数. csv_list 应为全部输入文件,
+        不在 csv_list 中的来源(例如更正后以新文件名重新下发的旧文件)会从状态中移除, 避免重复计数.
+
+        Args:
+            state_dir (Path): 计数状态的保存文件夹
+            csv_list (list[Path]): 文件数据路径, 未变化的文件直接跳过
+            window_days (int | None, optional): 滚动窗口天数, 只保留最近的天数. Defaults to None(全部保留).
+
+        Returns:
+            pd.DataFrame: 中心多日计算表格
+        """
+
+        self.logger.info("-增量汇总-开始-")
+
+        state = AggregateState(
+            state_dir,
+            key_cols=["揽收网点代码", "揽收网点名称", "实际交件日期", "实际交件时段"],
+            value_cols=["交件量", "延误量"],
+            date_col="实际交件日期",
+            str_cols=["揽收网点代码", "揽收网点名称"],
+            project_name=self.project_name,
+        )
+        manifest = ConversionManifest(state_dir, self.project_name, autosave=False)
+        target_format: str = f"state:{self.project_name}"
+
+        # 旧版本按文件名保存的来源无法区分不同文件夹中的同名文件, 移除后重新计算
+        sources: set[str] = set(state.sources())
+        legacy: list[str] = [s for s in sources if not Path(s).is_absolute()]
+        if legacy:
+            self.logger.warning(
+                f"计数状态中有 {len(legacy)} 个按文件名保存的来源, 将移除并重新计算对应文件"
+            )
+            state.remove(legacy)
+            sources -= set(legacy)
+
+        # 不在本次输入中的来源移除, 否则同一天以新文件名重新下发时会重复计数
+        current: set[str] = {str(p.resolve()) for p in csv_list}
+        missing: list[str] = sorted(sources - current)
+        if missing:
+            self.logger.warning(
+                f"计数状态中有 {len(missing)} 个来源不在本次输入中, 将移除: {missing}"
+            )
+            state.remove(missing)
+            sources -= set(missing)
+
+        updated: list[Path] = list()
+        for p in csv_list:
+            source: str = str(p.resolve())
+            if source in sources and manifest.is_fresh(p, state.path, target_format):
+                self.logger.info(f"'{p.name}' 未发生变化, 跳过")
+                continue
+
+            self.logger.info(f"-正在计算 '{p}' ")
+            state.replace(source, self.path_counts(p).reset_index())
+            updated.append(p)
+
+        if window_days is not None:
+            state.prune(window_days)
+        if state.frame.empty:
+            self.logger.error("计数状态中没有可汇总的数据")
+            raise ValueError()
+
+        # 状态写入成功后再记录文件, 中断时下次运行会重新计算
+        state.save()
+        for p in updated:
+            manifest.record(p, state.path, target_format)
+        manifest.flush()
+
+        self.logger.info(
+            f"新增/更新 {len(updated)} 个文件, 状态中共 {len(state.sources())} 个文件"
+        )
+
+        df_multi: pd.DataFrame = self.__summary(
+            self.__to_partial(self.__pivot(state.totals()))
+        )
+
+        self.logger.info("-增量汇总-结束-")
+
+        return df_multi
+
+    @staticmethod
+    def __summary(df_multi: pd.DataFrame) -> pd.DataFrame:
+        """将累加后的部分聚合结果整理成多日表, 并计算延误量占比"""
+
+        col_key: list[str] = ["揽收网点代码", "揽收网点名称", "实际交件日期"]
+
+        # 将单日表汇总成多日表
+        col_hour: list = sorted(c for c in df_multi.columns if isinstance(c, int))
         df_multi = (
-            df_multi.groupby(["揽收网点代码", "揽收网点名称", "实际交件日期"])
-            .sum()
+            df_multi.fillna(0)
+            .loc[:, col_hour + ["单日延误量", "单日总量"]]
             .reset_index()
-            .sort_values(by=["揽收网点代码", "揽收网点名称", "实际交件日期"])
+            .sort_values(by=col_key)
         )
 
         # --计算延误量占比
         df_multi["延误量占比"] = df_multi["单日延误量"] / df_multi["单日总量"]
         df_multi["延误量占比"] = df_multi["延误量占比"].apply(lambda x: f"{x: .2%}")
 
-        self.logger.info("-单日数据汇总-结束-")
-
         return df_multi
 
+    def partial_calculate(
+        self, path: Path, source: io.BytesIO | None = None
+    ) -> pd.DataFrame:
+        """计算单日表, 并整理成以网点和日期为索引的部分聚合结果, 便于累加
+
+        Args:
+            path (Path): 单日数据文件路径
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
+
+        Returns:
+            pd.DataFrame: 以 揽收网点代码, 揽收网点名称, 实际交件日期 为索引的单日表
+        """
+
+        return self.__to_partial(self.single_calculate(path, source))
+
+    @staticmethod
+    def __to_partial(
+        df_single: pd.DataFrame, col_key: list[str] | None = None
+    ) -> pd.DataFrame:
+        """将计算表格整理成以网点和日期为索引的部分聚合结果"""
+
+        col_key = col_key or ["揽收网点代码", "揽收网点名称", "实际交件日期"]
+        # 类别列的类别在各文件中不一致, 还原为普通列后再对齐累加
+        for col in col_key:
+            if isinstance(df_single[col].dtype, pd.CategoricalDtype):
+                df_single[col] = df_single[col].astype(
+                    df_single[col].cat.categories.dtype
+                )
+
+        return df_single.set_index(col_key)
+
+    @staticmethod
+    def __reduce(
+        df_multi: pd.DataFrame | None, df_single: pd.DataFrame
+    ) -> pd.DataFrame:
+        """将单日表按索引累加进多日表"""
+
+        if df_multi is None:
+            return df_single
+
+        return df_multi.add(df_single, fill_value=0)
+
     def operation(self, conversion: int = 1) -> pd.DataFrame:
         """该类的主运行方法
 
@@ -173,3 +654,11 @@ class CenterSubmission:
         self.logger.info("\n--中心交件量表格-制作流程-结束")
 
         return df_multi
+
+
+def _partial_calculate_worker(
+    path: Path, engine: str, chunksize: int | None = None
+) -> pd.DataFrame:
+    """进程池中计算单日表, 需要定义在模块顶层才能被子进程导入"""
+
+    return CenterSubmission(engine=engine, chunksize=chunksize).partial_calculate(path)
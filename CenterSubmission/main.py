@@ -7,6 +7,7 @@ import logging
 
 from CenterSubmission.CenterS_config import DataConfig
 from Package.LogConfig import LogConfig
+from Package.ExcelExport import ExcelExport
 from CenterSubmission.centersubmission import CenterSubmission
 
 if __name__ == "__main__":
@@ -20,6 +21,7 @@ if __name__ == "__main__":
     
     production: CenterSubmission = CenterSubmission()
     df_multi: pd.DataFrame = production.operation(conversion=0)
-    df_multi.to_excel(r"c:\Users\admin\Desktop\西宁中心各时段交件量-0101-0107.xlsx", index=False)
+    excelexport: ExcelExport = ExcelExport(dataconfig.project_name)
+    excelexport.to_excel(df_multi, r"c:\Users\admin\Desktop\西宁中心各时段交件量-0101-0107.xlsx")
     
     logger.info("--程序结束--")
\ No newline at end of file
@@ -1,26 +1,48 @@
 import sys
+from datetime import date
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+import numpy as np
 import pandas as pd
 import logging
 
 import Package as pkg
 from HeadquartersDaily.HqDaily_config import DataConfig
 
+if TYPE_CHECKING:
+    from Package.ParquetStore import ParquetStore
+
 
 class HeadquartersDaily:
     """总部日报报表"""
 
     config: DataConfig = DataConfig()
 
-    def __init__(self):
-        """初始化 HeadquartersDaily 类实例"""
+    def __init__(self, cache_dir: Path | None = None):
+        """初始化 HeadquartersDaily 类实例
+
+        Args:
+            cache_dir (Path | None, optional): 中间结果的缓存文件夹, 输入文件未变化时直接读取缓存. Defaults to None(不缓存).
+        """
         self.project_name: str = self.config.project_name
         self.logger: logging.Logger = logging.getLogger(
             f"{self.project_name}.{__name__}"
         )
+        # 列名到核心影响环节名称的对照表
+        self.stage_label: dict[str, str] = {
+            col: self.__stage_label(col)
+            for col in self.config.cal_col_1[2:] + self.config.cal_col_2[2:]
+        }
+        self.cache: pkg.FrameCache | None = (
+            pkg.FrameCache(
+                cache_dir, self.config.cache_max_mb * 1024**2, self.project_name
+            )
+            if cache_dir is not None
+            else None
+        )
 
     def read_path(self) -> list[Path]:
         """读取需要的文件路径
@@ -37,86 +59,275 @@ class HeadquartersDaily:
 
         return path_list
 
-    def city_cal(self, df: pd.DataFrame, category: str) -> pd.DataFrame:
-        """当日TOP线路拆分延误占比TOP3影响环节
+    @staticmethod
+    def __stage_label(col: str) -> str:
+        """由列名得到核心影响环节名称"""
+
+        for s in ["延误占比", "网点", "延误量"]:
+            col = col.replace(s, "")
+
+        return col
+
+    @staticmethod
+    def __row_rank(values: np.ndarray) -> np.ndarray:
+        """按行降序排名, 并列取最小名次(同 rank(method="min", ascending=False)), 空值排名为空"""
+
+        rank: np.ndarray = 1 + (values[:, None, :] > values[:, :, None]).sum(axis=2)
+        return np.where(np.isnan(values), np.nan, rank)
+
+    def city_cal(self, df: pd.DataFrame) -> pd.DataFrame:
+        """当日TOP线路同时拆分延误占比和延误量TOP3影响环节
+
+        直接在宽表上按行计算两个指标的排名, 保留两个指标排名相同且都在前3名的环节(派签环节始终保留).
 
         Args:
             df (pd.DataFrame): 当日TOP线路数据表
-            category (str): 计算类别
 
         Returns:
             pd.DataFrame: 拆分后表格
         """
 
-        if category == "延误占比":
-            col_need = self.config.cal_col_1[1:]
-        elif category == "延误量":
-            col_need = self.config.cal_col_2[1:]
+        col_ratio: list[str] = self.config.cal_col_1[2:]
+        col_amount: list[str] = self.config.cal_col_2[2:]
+        stage: np.ndarray = np.array([self.stage_label[c] for c in col_ratio])
 
-        city_cal = df.copy()
-        city_cal_melt = city_cal.melt(
-            id_vars=["日期", "城市线路名称"],
-            value_vars=col_need,
-            var_name="核心影响环节",
-            value_name=category,
+        ratio: np.ndarray = df.loc[:, col_ratio].to_numpy(dtype=float)
+        amount: np.ndarray = df.loc[:, col_amount].to_numpy(dtype=float)
+        rank_ratio: np.ndarray = self.__row_rank(ratio)
+        rank_amount: np.ndarray = self.__row_rank(amount)
+
+        mask_sign: np.ndarray = stage == "派签"
+        mask_same = (rank_ratio == rank_amount) | (
+            np.isnan(rank_ratio) & np.isnan(rank_amount)
+        )
+        mask = (
+            ((rank_ratio <= 3) | mask_sign)
+            & ((rank_amount <= 3) | mask_sign)
+            & mask_same
         )
 
-        city_cal_melt["rank"] = city_cal_melt.groupby("城市线路名称")[category].rank(
-            method="min", ascending=False
+        # 按环节顺序展开, 与原先 melt 后的行顺序一致
+        idx_stage, idx_row = np.nonzero(mask.T)
+
+        # 线路名称保留原表的类型, 类别列与原表连接时直接按类别编码匹配
+        return pd.DataFrame(
+            {
+                "日期": df["日期"].to_numpy()[idx_row],
+                "城市线路名称": df["城市线路名称"].take(idx_row).reset_index(drop=True),
+                "核心影响环节": pd.Categorical.from_codes(
+                    idx_stage, categories=pd.Index(stage)
+                ),
+                "延误占比": ratio[idx_row, idx_stage],
+                "rank": rank_ratio[idx_row, idx_stage],
+                "延误量": amount[idx_row, idx_stage],
+            }
         )
-        for s in ["延误占比", "网点", "延误量"]:
-            city_cal_melt["核心影响环节"] = city_cal_melt["核心影响环节"].str.replace(
-                s, "", regex=False
-            )
-        mask = (city_cal_melt["rank"] <= 3) | (city_cal_melt["核心影响环节"] == "派签")
 
-        return city_cal_melt.loc[mask]
+    def read_store(
+        self,
+        store: "ParquetStore",
+        start: date | None = None,
+        end: date | None = None,
+    ) -> pd.DataFrame:
+        """从 Parquet 数据仓库读取城市线路汇总数据, 只读取报表需要的列和日期分区
 
-    def report_production(self, path_list: list[Path]) -> pd.DataFrame:
-        """报表制作逻辑
+        Args:
+            store (ParquetStore): 数据仓库
+            start (date | None, optional): 开始日期(包含). Defaults to None.
+            end (date | None, optional): 结束日期(包含). Defaults to None.
+
+        Returns:
+            pd.DataFrame: 城市线路汇总表
+        """
+
+        return store.query(
+            self.project_name, columns=self.config.cityroute_col, start=start, end=end
+        )
+
+    def report_production(
+        self, path_list: list[Path], cityroute: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
+        """报表制作逻辑, 各阶段的耗时和内存记录在阶段指标日志中
 
         Args:
             path_list (list[Path]): 文件路径
+            cityroute (pd.DataFrame | None, optional): 城市线路汇总表, None 时从文件读取. Defaults to None.
 
         Returns:
             pd.DataFrame: 制作好的报表
         """
 
-        for p in path_list:
-            if "GPT" in p.name:
-                gpt1 = pd.read_excel(p, sheet_name="改善方案", skiprows=1)
-                gpt2 = pd.read_excel(p, sheet_name="GPT", skiprows=[1, 2])
-            if "城市线路汇总" in p.name:
-                cityroute = pd.read_excel(p)
+        with pkg.StageProfiler("读取输入文件", self.project_name) as prof:
+            gpt1, gpt2, cityroute, source = self.__read_inputs(path_list, cityroute)
+            prof.rows_out = len(cityroute)
 
-        cityroute["日期"] = pd.to_datetime(cityroute["日期"], format="mixed").dt.date
-        row_set = set(cityroute["城市线路名称"]) - set(gpt2["城市线路"])
+        # 筛选延误占比和延误量的TOP3环节
+        with pkg.StageProfiler(
+            "筛选TOP3环节", self.project_name, rows_in=len(cityroute)
+        ) as prof:
+            city_day = self.__cached("city_day", source, self.city_cal, cityroute)
+            prof.rows_out = len(city_day)
+
+        with pkg.StageProfiler(
+            "匹配改善方案", self.project_name, rows_in=len(gpt1)
+        ) as prof:
+            report = self.__match_report(city_day, cityroute, gpt1, gpt2)
+            prof.rows_out = len(report)
+
+        return report
+
+    def __cached(
+        self,
+        name: str,
+        source: Path | pd.DataFrame,
+        func: Callable[..., pd.DataFrame],
+        *args,
+    ) -> pd.DataFrame:
+        """计算中间结果, 设置了缓存文件夹时以输入和代码版本为键读取或写入缓存
+
+        Args:
+            name (str): 中间结果的名称
+            source (Path | pd.DataFrame): 城市线路汇总的来源文件或数据表
+            func (Callable[..., pd.DataFrame]): 计算函数
+
+        Returns:
+            pd.DataFrame: 中间结果
+        """
+
+        if self.cache is None:
+            return func(*args)
+
+        key: str = self.cache.key(
+            name,
+            source,
+            repr(self.config),
+            pkg.FrameCache.code_version(
+                HeadquartersDaily, pkg.TimeParsing, pkg.DtypeOptimize
+            ),
+        )
 
-        # 筛选占比
-        city_cal_1 = cityroute.copy().loc[:, self.config.cal_col_1]
-        city_cal_1 = self.city_cal(city_cal_1, "延误占比")
+        return self.cache.get_or_compute(key, func, *args)
 
-        # 筛选延误量
-        city_cal_2 = cityroute.copy().loc[:, self.config.cal_col_2]
-        city_cal_2 = self.city_cal(city_cal_2, "延误量")
+    def __parse_cityroute(self, cityroute: pd.DataFrame) -> pd.DataFrame:
+        """解析城市线路汇总表的日期, 并压缩列类型"""
 
-        # 合并延误量和延误占比
-        city_day = pd.merge(
-            city_cal_1,
-            city_cal_2,
-            how="inner",
-            on=["日期", "城市线路名称", "核心影响环节", "rank"],
+        cityroute["日期"] = (
+            pkg.TimeParsing(self.project_name).parse(cityroute["日期"]).dt.date
+        )
+
+        cityroute = self.__drop_duplicates(cityroute)
+
+        # 线路名称等字符串列转换为类别列; 比例列后续参与除法, 保持 float64 以免结果精度变化
+        optimize = pkg.DtypeOptimize(self.project_name, downcast_float=False)
+
+        return optimize.optimize(cityroute)
+
+    def __drop_duplicates(self, cityroute: pd.DataFrame) -> pd.DataFrame:
+        """同一日期同一线路有多行时只保留第一行, 并记录重复的行
+
+        每个 日期 + 线路 只能有一行汇总数据, 重复行会使匹配结果中的改善方案重复.
+        """
+
+        col_key: list[str] = ["日期", "城市线路名称"]
+        mask_dup = cityroute.duplicated(subset=col_key, keep=False)
+        if not mask_dup.any():
+            return cityroute
+
+        df_dup: pd.DataFrame = cityroute.loc[mask_dup, col_key]
+        # 读取的表为默认索引时, 索引 + 2 为 Excel 中的行号(第1行为表头)
+        rows: list[str] = [
+            f"第{i + 2}行 {d} {r}"
+            for i, d, r in df_dup.head(10).itertuples(index=True, name=None)
+        ]
+        n_drop: int = int(cityroute.duplicated(subset=col_key, keep="first").sum())
+        self.logger.warning(
+            f"城市线路汇总中有 {df_dup.drop_duplicates().shape[0]: ,} 个 日期 + 线路 重复, "
+            f"每个只保留第一行, 共删除 {n_drop: ,} 行. 重复的行(前10行): {rows}"
+        )
+
+        return cityroute.drop_duplicates(subset=col_key, keep="first").reset_index(
+            drop=True
+        )
+
+    def __read_inputs(
+        self, path_list: list[Path], cityroute: pd.DataFrame | None = None
+    ) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Path | pd.DataFrame]:
+        """读取GPT文件的 改善方案, GPT 工作表和城市线路汇总表
+
+        设置了缓存文件夹时, 城市线路汇总文件未变化则直接读取解析后的缓存, 不再读取 Excel.
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Path | pd.DataFrame]: 改善方案表, GPT表, 城市线路汇总表, 城市线路汇总的来源(文件或传入的数据表)
+        """
+
+        loader = pkg.WorkbookLoader(self.project_name)
+        required: list[str] | None = ["gpt"] if cityroute is not None else None
+        files: dict[str, Path] = loader.match_files(
+            path_list, self.config.input_files, required=required
+        )
+
+        # GPT文件只打开一次, 读取 改善方案 和 GPT 两个工作表
+        gpt_sheets: dict[str, pd.DataFrame] = loader.read_sheets(
+            files["gpt"], self.config.gpt_sheets
+        )
+        gpt1, gpt2 = gpt_sheets["改善方案"], gpt_sheets["GPT"]
+
+        source: Path | pd.DataFrame
+        if cityroute is None:
+            source = files["cityroute"]
+            cityroute = self.__cached(
+                "cityroute",
+                source,
+                lambda: self.__parse_cityroute(loader.read_sheet(source)),
+            )
+        else:
+            # 传入的数据表以解析后的内容作为后续缓存键的来源
+            cityroute = self.__parse_cityroute(cityroute)
+            source = cityroute
+
+        gpt1 = pkg.DtypeOptimize(self.project_name, downcast_float=False).optimize(gpt1)
+
+        return gpt1, gpt2, cityroute, source
+
+    def __match_report(
+        self,
+        city_day: pd.DataFrame,
+        cityroute: pd.DataFrame,
+        gpt1: pd.DataFrame,
+        gpt2: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """当日TOP环节与改善方案匹配, 区分消除情况, 并补充GPT外的线路
+
+        Args:
+            city_day (pd.DataFrame): 当日TOP环节
+            cityroute (pd.DataFrame): 城市线路汇总表
+            gpt1 (pd.DataFrame): 改善方案表
+            gpt2 (pd.DataFrame): GPT表
+
+        Returns:
+            pd.DataFrame: 制作好的报表
+        """
+
+        row_set = set(cityroute["城市线路名称"]) - set(gpt2["城市线路"])
+
+        # 日期, 线路和环节各编码一次, 两次连接都按整数键匹配, 并检查右表的键唯一
+        index = (
+            pkg.KeyIndex(self.project_name)
+            .add("日期", cityroute["日期"])
+            .add("线路", cityroute["城市线路名称"], gpt1["线路名称"])
+            .add("环节", city_day["核心影响环节"], gpt1["核心影响环节"])
         )
 
         mask_route = (city_day["核心影响环节"] == "路由") & (city_day["延误量"] <= 100)
         mask_trans = (city_day["核心影响环节"] == "运输") & (city_day["延误量"] <= 10)
         mask_day = ~(mask_route | mask_trans)
 
-        city_day = city_day.copy().loc[mask_day]
-        city_day = city_day.merge(
-            cityroute.loc[:, ["城市线路名称", "与第一差值(%)", "未达成量"]],
-            how="left",
-            on=["城市线路名称"],
+        # 同一线路有多个日期时按 日期 + 线路 匹配, 避免只按线路匹配时行数成倍增加
+        city_day = index.merge(
+            city_day.loc[mask_day],
+            cityroute.loc[:, ["日期", "城市线路名称", "与第一差值(%)", "未达成量"]],
+            on=["日期", "城市线路名称"],
+            dims=["日期", "线路"],
         )
 
         # 重命名列名
@@ -134,8 +345,14 @@ class HeadquartersDaily:
         mask_data = (city_day["延误占比"] < 0.05) & (city_day["核心影响环节"] != "派签")
         city_day = city_day.loc[~mask_data]
 
-        # 开始和原表进行匹配
-        city_match = city_day.copy()
+        # 开始和原表进行匹配, 有多个日期时只用最新一天的数据复盘
+        latest = city_day["GPT展示日期"].max()
+        city_match = city_day.loc[city_day["GPT展示日期"] == latest].copy()
+        if len(city_match) < len(city_day):
+            self.logger.info(
+                f"城市线路汇总有多个日期, 使用最新日期 {latest} 的 "
+                f"{len(city_match): ,} 行复盘改善方案"
+            )
         city_match = city_match.rename(
             columns={
                 "与第一差值": "与第一差值-复盘",
@@ -152,9 +369,12 @@ class HeadquartersDaily:
 
         gpt_match = gpt1.loc[:, self.config.gpt_col]
 
-        # 连接两表
-        report_match = pd.merge(
-            gpt_match, city_match, how="left", on=["线路名称", "核心影响环节"]
+        # 连接两表, 复盘数据每个 线路 + 环节 只有一行
+        report_match = index.merge(
+            gpt_match,
+            city_match,
+            on=["线路名称", "核心影响环节"],
+            dims=["线路", "环节"],
         )
 
         report_match["环比"] = (
@@ -4,6 +4,9 @@ from dataclasses import dataclass, field
 class DataConfig():
     project_name: str = field(default="HeadquartersDaily")
     
+    # 中间结果缓存的总大小上限(MB), 超过时删除最久未使用的缓存
+    cache_max_mb: int = field(default=2048)
+    
     cal_col_1: list[str] = field(default_factory=lambda: [
         "日期",
         "城市线路名称",
@@ -26,6 +29,38 @@ class DataConfig():
         "派签延误量"
     ])
     
+    # 输入文件: 文件键 -> 文件名关键字
+    input_files: dict[str, str] = field(default_factory=lambda: {
+        "gpt": "GPT",
+        "cityroute": "城市线路汇总"
+    })
+    
+    # GPT文件需要读取的工作表: 工作表名称 -> 读取参数
+    gpt_sheets: dict[str, dict] = field(default_factory=lambda: {
+        "改善方案": {"skiprows": 1},
+        "GPT": {"skiprows": [1, 2], "usecols": ["城市线路"]}
+    })
+    
+    # 城市线路汇总表中报表需要的列
+    cityroute_col: list[str] = field(default_factory=lambda: [
+        "日期",
+        "城市线路名称",
+        "路由延误占比",
+        "网点交件延误占比",
+        "出港延误占比",
+        "运输延误占比",
+        "进港延误占比",
+        "派签延误占比",
+        "路由延误量",
+        "网点交件延误量",
+        "出港延误量",
+        "运输延误量",
+        "进港延误量",
+        "派签延误量",
+        "与第一差值(%)",
+        "未达成量"
+    ])
+    
     gpt_col: list[str] = field(default_factory=lambda: [
         "GPT展示日期",
         "线路名称",
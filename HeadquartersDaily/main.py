@@ -32,6 +32,7 @@ if __name__ == "__main__":
     report: pd.DataFrame = hqdaily.operation()
     
     path = r"c:\Users\admin\Desktop\改善方案.xlsx"
-    report.to_excel(path, index=False)
+    excelexport: pkg.ExcelExport = pkg.ExcelExport(project_name)
+    excelexport.to_excel(report, path)
     
     logger.info("--程序结束--")
\ No newline at end of file
@@ -0,0 +1,157 @@
+import logging
+import os
+import pandas as pd
+
+from datetime import date, timedelta
+from pathlib import Path
+
+
+class AggregateState:
+    """持久化的聚合状态, 按来源文件保存计数, 同一来源重新写入时替换旧计数"""
+
+    file_name: str = "state.parquet"
+    source_col: str = "来源"
+
+    def __init__(
+        self,
+        state_dir: Path,
+        key_cols: list[str],
+        value_cols: list[str],
+        date_col: str,
+        str_cols: list[str] | None = None,
+        project_name: str = "AggregateState",
+    ):
+        """初始化 AggregateState 类实例
+
+        Args:
+            state_dir (Path): 状态文件所在的文件夹
+            key_cols (list[str]): 聚合键
+            value_cols (list[str]): 计数列
+            date_col (str): 聚合键中的日期列, 用于滚动窗口
+            str_cols (list[str] | None, optional): 统一保存为字符串的聚合键, 避免同一列中混合数字和字符串导致写入失败. Defaults to None.
+            project_name (str, optional): 项目名称. Defaults to "AggregateState".
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.path: Path = Path(state_dir) / self.file_name
+        self.key_cols: list[str] = key_cols
+        self.value_cols: list[str] = value_cols
+        self.date_col: str = date_col
+        self.str_cols: list[str] = str_cols or list()
+        self.frame: pd.DataFrame = self.__load()
+
+    def __load(self) -> pd.DataFrame:
+        """读取状态文件, 文件不存在时返回空状态"""
+
+        columns: list[str] = [self.source_col] + self.key_cols + self.value_cols
+        if not self.path.exists():
+            return pd.DataFrame(columns=columns)
+
+        df: pd.DataFrame = pd.read_parquet(self.path)
+        missing: list[str] = [col for col in columns if col not in df.columns]
+        if missing:
+            self.logger.error(f"状态文件 '{self.path}' 缺少列: {missing}")
+            raise ValueError()
+
+        return self.__to_str(df.loc[:, columns])
+
+    def __to_str(self, df: pd.DataFrame) -> pd.DataFrame:
+        """str_cols 转换为字符串, 旧状态文件中的数字代码与新写入的字符串代码保持一致"""
+
+        for col in self.str_cols:
+            if not df.empty and not pd.api.types.is_object_dtype(df[col]):
+                df[col] = df[col].astype(str)
+
+        return df
+
+    def save(self) -> Path:
+        """写入状态文件, 先写临时文件再替换, 避免中断时损坏状态
+
+        Returns:
+            Path: 状态文件路径
+        """
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = self.path.with_suffix(".tmp")
+        self.frame.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.replace(tmp_path, self.path)
+
+        return self.path
+
+    def sources(self) -> list[str]:
+        """状态中已有的来源"""
+
+        return sorted(self.frame[self.source_col].unique())
+
+    def replace(self, source: str, df: pd.DataFrame) -> None:
+        """用新的计数替换某个来源的旧计数, 重复写入同一来源结果不变
+
+        Args:
+            source (str): 来源名称, 一般为文件的绝对路径
+            df (pd.DataFrame): 包含 key_cols 和 value_cols 的计数表
+        """
+
+        mask_old: pd.Series = self.frame[self.source_col] == source
+        if mask_old.any():
+            self.logger.info(f"来源 '{source}' 已存在, 替换原有的 {mask_old.sum()} 行")
+
+        df_new: pd.DataFrame = self.__to_str(
+            df.loc[:, self.key_cols + self.value_cols].copy()
+        )
+        df_new.insert(0, self.source_col, source)
+
+        frames: list[pd.DataFrame] = [
+            f for f in [self.frame.loc[~mask_old], df_new] if not f.empty
+        ]
+        self.frame = (
+            pd.concat(frames, ignore_index=True) if frames else self.frame.iloc[0:0]
+        )
+
+    def remove(self, sources: list[str]) -> None:
+        """移除指定来源的计数
+
+        Args:
+            sources (list[str]): 来源名称
+        """
+
+        mask_old: pd.Series = self.frame[self.source_col].isin(sources)
+        if mask_old.any():
+            self.frame = self.frame.loc[~mask_old].reset_index(drop=True)
+            self.logger.info(f"移除 {len(sources)} 个来源的 {mask_old.sum()} 行")
+
+    def prune(self, window_days: int) -> list[date]:
+        """只保留最近 window_days 天的计数
+
+        Args:
+            window_days (int): 滚动窗口天数
+
+        Returns:
+            list[date]: 被移除的日期
+        """
+
+        if window_days <= 0:
+            self.logger.error(f"滚动窗口天数必须为正整数, 当前为: {window_days}")
+            raise ValueError()
+        if self.frame.empty:
+            return list()
+
+        days: pd.Series = self.frame[self.date_col]
+        start: date = days.max() - timedelta(days=window_days - 1)
+        mask_old: pd.Series = days < start
+        dropped: list[date] = sorted(days.loc[mask_old].unique())
+        if dropped:
+            self.frame = self.frame.loc[~mask_old].reset_index(drop=True)
+            self.logger.info(
+                f"移除滚动窗口外的 {len(dropped)} 天: {dropped[0]} ~ {dropped[-1]}"
+            )
+
+        return dropped
+
+    def totals(self) -> pd.DataFrame:
+        """汇总所有来源的计数
+
+        Returns:
+            pd.DataFrame: 以 key_cols 为索引的计数表
+        """
+
+        return self.frame.groupby(self.key_cols)[self.value_cols].sum().astype("int64")
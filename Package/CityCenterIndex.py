@@ -0,0 +1,343 @@
+import json
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .ConversionManifest import ConversionManifest
+
+
+class CityCenterIndex:
+    """城市对应中心的查找索引
+
+    城市和中心都编码为整数, 中心线路ID = 始发中心编码 * 中心数 + 目的中心编码,
+    连接时使用整数键代替字符串拼接和字符串匹配. 索引保存为 npz 文件, 基础表未变化时直接读取.
+    """
+
+    # 索引文件格式版本, 格式变化时递增, 旧版本的索引文件会被重新生成
+    version: int = 1
+    # 缺失值的编码
+    missing: int = -1
+
+    def __init__(
+        self,
+        cities: np.ndarray,
+        centers: np.ndarray,
+        city_center: np.ndarray,
+        meta: dict[str, Any] | None = None,
+        project_name: str = "CityCenterIndex",
+    ):
+        """初始化 CityCenterIndex 类实例, 一般通过 build / load / from_csv 创建
+
+        Args:
+            cities (np.ndarray): 城市名称, 按名称排序
+            centers (np.ndarray): 中心名称, 按名称排序
+            city_center (np.ndarray): 每个城市对应的中心编码
+            meta (dict[str, Any] | None, optional): 索引信息(版本, 基础表哈希等). Defaults to None.
+            project_name (str, optional): 项目名称. Defaults to "CityCenterIndex".
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.cities: pd.Index = pd.Index(cities)
+        self.centers: pd.Index = pd.Index(centers)
+        self.city_center: np.ndarray = np.asarray(city_center, dtype=np.int32)
+        self.meta: dict[str, Any] = meta or dict()
+        # 各分隔符下全部中心线路名称到线路ID的映射, 第一次按名称查找时生成
+        self.__route_lookup: dict[str, pd.Series] = dict()
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        city_col: str = "城市",
+        center_col: str = "发货中心",
+        project_name: str = "CityCenterIndex",
+    ) -> "CityCenterIndex":
+        """由城市对应中心基础表生成索引
+
+        Args:
+            df (pd.DataFrame): 城市对应中心基础表
+            city_col (str, optional): 城市列. Defaults to "城市".
+            center_col (str, optional): 中心列. Defaults to "发货中心".
+            project_name (str, optional): 项目名称. Defaults to "CityCenterIndex".
+
+        Returns:
+            CityCenterIndex: 索引
+        """
+
+        # 同一城市出现多次时保留最后一条, 与 set_index().to_dict() 一致
+        pairs: pd.DataFrame = df.loc[:, [city_col, center_col]].dropna(
+            subset=[city_col]
+        )
+        pairs = pairs.drop_duplicates(subset=city_col, keep="last")
+        pairs = pairs.astype({city_col: str}).sort_values(by=city_col)
+
+        center_cat = pd.Categorical(pairs[center_col].dropna().astype(str))
+        city_center: np.ndarray = pd.Categorical(
+            pairs[center_col], categories=center_cat.categories
+        ).codes
+
+        meta: dict[str, Any] = {
+            "version": cls.version,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "n_cities": int(len(pairs)),
+            "n_centers": int(len(center_cat.categories)),
+        }
+
+        return cls(
+            pairs[city_col].to_numpy(dtype=str),
+            center_cat.categories.to_numpy(dtype=str),
+            city_center,
+            meta=meta,
+            project_name=project_name,
+        )
+
+    def save(self, path: Path) -> Path:
+        """保存索引, 先写临时文件再替换
+
+        Args:
+            path (Path): 索引文件路径(.npz)
+
+        Returns:
+            Path: 索引文件路径
+        """
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = path.with_name(f"{path.stem}.tmp.npz")
+        np.savez(
+            tmp_path,
+            cities=self.cities.to_numpy(dtype=str),
+            centers=self.centers.to_numpy(dtype=str),
+            city_center=self.city_center,
+            meta=np.array(json.dumps(self.meta, ensure_ascii=False)),
+        )
+        os.replace(tmp_path, path)
+
+        self.logger.info(f"城市中心索引已保存: {path}")
+
+        return path
+
+    @classmethod
+    def load(
+        cls, path: Path, project_name: str = "CityCenterIndex"
+    ) -> "CityCenterIndex":
+        """读取索引文件
+
+        Args:
+            path (Path): 索引文件路径(.npz)
+            project_name (str, optional): 项目名称. Defaults to "CityCenterIndex".
+
+        Returns:
+            CityCenterIndex: 索引
+        """
+
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["cities"],
+                data["centers"],
+                data["city_center"],
+                meta=json.loads(str(data["meta"])),
+                project_name=project_name,
+            )
+
+    @classmethod
+    def from_csv(
+        cls,
+        csv_path: Path,
+        index_path: Path | None = None,
+        city_col: str = "城市",
+        center_col: str = "发货中心",
+        project_name: str = "CityCenterIndex",
+    ) -> "CityCenterIndex":
+        """读取基础表对应的索引, 索引不存在, 版本不同或基础表已变化时重新生成并保存
+
+        Args:
+            csv_path (Path): 城市对应中心基础表(csv)
+            index_path (Path | None, optional): 索引文件路径, None 时保存在基础表旁边. Defaults to None.
+            city_col (str, optional): 城市列. Defaults to "城市".
+            center_col (str, optional): 中心列. Defaults to "发货中心".
+            project_name (str, optional): 项目名称. Defaults to "CityCenterIndex".
+
+        Returns:
+            CityCenterIndex: 索引
+        """
+
+        logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        csv_path = Path(csv_path)
+        index_path = Path(index_path or csv_path.with_suffix(".index.npz"))
+        source_hash: str = ConversionManifest.file_hash(csv_path)
+
+        if index_path.exists():
+            start_time: float = time.time()
+            index: CityCenterIndex = cls.load(index_path, project_name=project_name)
+            if (
+                index.meta.get("version") == cls.version
+                and index.meta.get("source_hash") == source_hash
+            ):
+                logger.info(
+                    f"读取城市中心索引 '{index_path.name}' 耗时: "
+                    f"{(time.time() - start_time) * 1000:.1f}毫秒"
+                )
+                return index
+            logger.info(f"基础表 '{csv_path.name}' 已变化或索引版本不同, 重新生成索引")
+
+        index = cls.build(
+            pd.read_csv(csv_path, usecols=[city_col, center_col]),
+            city_col=city_col,
+            center_col=center_col,
+            project_name=project_name,
+        )
+        index.meta["source"] = csv_path.name
+        index.meta["source_hash"] = source_hash
+        index.save(index_path)
+
+        return index
+
+    def city_codes(self, cities: pd.Series) -> np.ndarray:
+        """城市名称转换为城市编码, 不在索引中的城市为 -1"""
+
+        return self.cities.get_indexer(pd.Series(cities).astype(object))
+
+    def center_codes(self, cities: pd.Series) -> np.ndarray:
+        """城市名称转换为对应中心的编码, 没有对应中心的城市为 -1"""
+
+        city: np.ndarray = self.city_codes(cities)
+        return np.where(
+            city >= 0, self.city_center[np.maximum(city, 0)], self.missing
+        ).astype(np.int32)
+
+    def center_of(self, cities: pd.Series) -> pd.Categorical:
+        """城市对应的中心名称, 以中心为类别的分类数据返回"""
+
+        return pd.Categorical.from_codes(
+            self.center_codes(cities), categories=self.centers
+        )
+
+    def __pair_ids(self, origin: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """由始发和目的中心编码计算中心线路ID"""
+
+        ids: np.ndarray = origin.astype(np.int64) * len(self.centers) + target
+        return np.where((origin >= 0) & (target >= 0), ids, self.missing)
+
+    def route_ids(self, origin_city: pd.Series, target_city: pd.Series) -> np.ndarray:
+        """由发货城市和签收城市计算中心线路ID
+
+        Args:
+            origin_city (pd.Series): 发货城市
+            target_city (pd.Series): 签收城市
+
+        Returns:
+            np.ndarray: 中心线路ID, 任一城市没有对应中心时为 -1
+        """
+
+        return self.__pair_ids(
+            self.center_codes(origin_city), self.center_codes(target_city)
+        )
+
+    def route_ids_from_centers(
+        self, origin_center: pd.Series, target_center: pd.Series
+    ) -> np.ndarray:
+        """由始发中心和目的中心名称计算中心线路ID"""
+
+        origin: np.ndarray = self.centers.get_indexer(
+            pd.Series(origin_center).astype(object)
+        )
+        target: np.ndarray = self.centers.get_indexer(
+            pd.Series(target_center).astype(object)
+        )
+
+        return self.__pair_ids(origin, target)
+
+    def route_ids_from_names(self, names: pd.Series, sep: str = "-") -> np.ndarray:
+        """由 '始发中心-目的中心' 格式的线路名称计算中心线路ID, 只对不重复的名称查找
+
+        名称与全部中心线路的名称整体匹配, 不拆分字符串, 中心名称中含有分隔符时也能识别.
+
+        Args:
+            names (pd.Series): 线路名称, 例如中心线路或频次名称
+            sep (str, optional): 始发中心和目的中心之间的分隔符. Defaults to "-".
+
+        Returns:
+            np.ndarray: 中心线路ID, 名称无法识别时为 -1
+        """
+
+        codes, uniques = pd.factorize(pd.Series(names), use_na_sentinel=True)
+        unique_ids: np.ndarray = (
+            self.__routes(sep)
+            .reindex(pd.Index(uniques, dtype=object))
+            .fillna(self.missing)
+            .to_numpy(dtype=np.int64)
+        )
+
+        return np.where(codes >= 0, unique_ids[np.maximum(codes, 0)], self.missing)
+
+    def __routes(self, sep: str) -> pd.Series:
+        """全部中心线路名称到线路ID的映射, 不同线路得到相同名称时无法区分, 不参与匹配"""
+
+        if sep not in self.__route_lookup:
+            ids: np.ndarray = np.arange(len(self.centers) ** 2, dtype=np.int64)
+            names: pd.Series = self.route_name(pd.Series(ids), sep=sep)
+            duplicated: pd.Series = names.duplicated(keep=False)
+            if duplicated.any():
+                self.logger.warning(
+                    f"{names[duplicated].nunique()} 个中心线路名称对应多条线路, "
+                    f"按名称无法识别: {names[duplicated].unique()[:10].tolist()}"
+                )
+            self.__route_lookup[sep] = pd.Series(
+                ids[~duplicated.to_numpy()], index=names[~duplicated].to_numpy()
+            )
+
+        return self.__route_lookup[sep]
+
+    def route_name(self, route_ids: pd.Series, sep: str = "-") -> pd.Series:
+        """中心线路ID转换为 '始发中心-目的中心' 格式的名称, -1 为空值"""
+
+        ids: np.ndarray = np.asarray(route_ids, dtype=np.int64)
+        unique_ids, inverse = np.unique(ids, return_inverse=True)
+        n: int = len(self.centers)
+        centers: np.ndarray = self.centers.to_numpy(dtype=object)
+        names: np.ndarray = np.array(
+            [
+                f"{centers[i // n]}{sep}{centers[i % n]}" if i >= 0 else None
+                for i in unique_ids
+            ],
+            dtype=object,
+        )
+
+        return pd.Series(names[inverse], index=getattr(route_ids, "index", None))
+
+    def join(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        on: str = "线路ID",
+        how: str = "left",
+    ) -> pd.DataFrame:
+        """按中心线路ID连接两表, 缺失的线路ID(-1)不参与匹配
+
+        线路ID只用于连接, 不保留在结果中, 结果的列与按线路名称连接时相同.
+
+        Args:
+            left (pd.DataFrame): 左表
+            right (pd.DataFrame): 右表
+            on (str, optional): 线路ID列. Defaults to "线路ID".
+            how (str, optional): 连接方式, 同 pd.merge. Defaults to "left".
+
+        Returns:
+            pd.DataFrame: 连接后的表, 不含线路ID列
+        """
+
+        for name, df in [("左表", left), ("右表", right)]:
+            if on not in df.columns:
+                self.logger.error(f"{name}中没有线路ID列: {on}")
+                raise ValueError()
+
+        right = right.loc[right[on] != self.missing]
+
+        return pd.merge(left, right, how=how, on=on).drop(columns=on)
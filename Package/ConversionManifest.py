@@ -0,0 +1,177 @@
+import hashlib
+import io
+import json
+import logging
+import os
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+
+class ConversionManifest:
+    """转换清单, 记录源文件指纹和转换结果, 用于跳过未发生变化的文件"""
+
+    file_name: str = ".conversion_manifest.json"
+
+    def __init__(
+        self,
+        manifest_dir: Path,
+        project_name: str = "ConversionManifest",
+        autosave: bool = True,
+    ):
+        """初始化 ConversionManifest 类实例
+
+        Args:
+            manifest_dir (Path): 清单文件所在的文件夹, 一般为转换结果的输出文件夹
+            project_name (str, optional): 项目名称. Defaults to "ConversionManifest".
+            autosave (bool, optional): 每次修改后立即写入清单文件. 批量转换时设为 False, 全部完成后调用 flush 或退出上下文时只写入一次. Defaults to True.
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.path: Path = Path(manifest_dir) / self.file_name
+        self.autosave: bool = autosave
+        self.entries: dict[str, dict[str, Any]] = self.__load()
+        self.__dirty: bool = False
+
+    def __enter__(self) -> "ConversionManifest":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # 中断时也写入已完成的记录, 下次运行不必重新转换
+        self.flush()
+
+    def __load(self) -> dict[str, dict[str, Any]]:
+        """读取清单文件, 文件不存在或损坏时返回空清单"""
+
+        if not self.path.exists():
+            return dict()
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"转换清单 '{self.path}' 读取失败, 将重新生成: {e}")
+            return dict()
+
+    def save(self) -> None:
+        """写入清单文件, 先写临时文件再替换, 避免中断时损坏清单"""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self.__dirty = False
+
+    def flush(self) -> None:
+        """有未写入的修改时写入清单文件"""
+
+        if self.__dirty:
+            self.save()
+
+    def __changed(self) -> None:
+        """记录清单已修改, autosave 时立即写入"""
+
+        self.__dirty = True
+        if self.autosave:
+            self.save()
+
+    @staticmethod
+    def __key(source: Path, target_format: str) -> str:
+        """清单中的键: 源文件绝对路径 + 目标格式"""
+
+        return f"{Path(source).resolve()}|{target_format}"
+
+    @staticmethod
+    def file_hash(path: Path, block_size: int = 1024 * 1024) -> str:
+        """分块计算文件内容的 sha256
+
+        Args:
+            path (Path): 文件路径
+            block_size (int, optional): 每次读取的字节数. Defaults to 1MB.
+
+        Returns:
+            str: 十六进制哈希值
+        """
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while block := f.read(block_size):
+                digest.update(block)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def buffer_hash(data: io.BytesIO) -> str:
+        """计算已读入内存的文件内容的 sha256, 与 file_hash 的结果相同"""
+
+        return hashlib.sha256(data.getbuffer()).hexdigest()
+
+    def is_fresh(self, source: Path, target: Path, target_format: str) -> bool:
+        """判断源文件自上次转换后是否未发生变化
+
+        大小和修改时间都一致时直接判定未变化; 只有修改时间不同时才计算内容哈希.
+
+        Args:
+            source (Path): 源文件路径
+            target (Path): 转换后的文件路径
+            target_format (str): 转换后的文件格式
+
+        Returns:
+            bool: True 表示可以跳过转换
+        """
+
+        entry: dict[str, Any] | None = self.entries.get(
+            self.__key(source, target_format)
+        )
+        if entry is None or not Path(target).exists():
+            return False
+        if Path(entry["target"]) != Path(target).resolve():
+            return False
+
+        stat = Path(source).stat()
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+
+        # 修改时间变化但内容未变(例如文件被重新复制), 更新修改时间后跳过
+        if self.file_hash(source) != entry["sha256"]:
+            return False
+
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self.__changed()
+
+        return True
+
+    def record(
+        self,
+        source: Path,
+        target: Path,
+        target_format: str,
+        schema: list[str] | dict[str, str] | None = None,
+        sha256: str | None = None,
+    ) -> None:
+        """记录一次成功的转换
+
+        Args:
+            source (Path): 源文件路径
+            target (Path): 转换后的文件路径
+            target_format (str): 转换后的文件格式
+            schema (list[str] | dict[str, str] | None, optional): 转换结果的列名或列名-类型. Defaults to None.
+            sha256 (str | None, optional): 已计算的源文件哈希, None 时读取源文件计算. Defaults to None.
+        """
+
+        stat = Path(source).stat()
+        self.entries[self.__key(source, target_format)] = {
+            "source": str(Path(source).resolve()),
+            "target": str(Path(target).resolve()),
+            "target_format": target_format,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256 or self.file_hash(source),
+            "schema": schema,
+            "converted_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.__changed()
@@ -1,25 +1,50 @@
+import io
 import logging
+import os
 import time
 import csv
 import pandas as pd
 
-from alive_progress import alive_bar
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from openpyxl import load_workbook
 from pathlib import Path
 from tqdm import tqdm
 
+from .ConversionManifest import ConversionManifest
+from .FilePathReading import PathReading
+from .FilePrefetch import FilePrefetcher
+from .LogConfig import LogConfig
+from .StageProfiler import StageProfiler
+
 
 class ExcelToCsv:
     """该类将excel文件转换为csv文件"""
 
-    def __init__(self, project_name: str = "ExcelToCsv", method: str = "dir"):
+    def __init__(
+        self,
+        project_name: str = "ExcelToCsv",
+        method: str = "dir",
+        workers: int = 1,
+        cache: bool = True,
+        prefetch_mb: int = 256,
+    ):
         """初始化 ExcelToCsv 类实例
 
         Args:
             project_name (str, optional): 项目名称. Defaults to "ExcelToCsv".
             method (str, optional): 该类的转换模式, 可选的值有: "dir", "file". Defaults to "dir".
+            workers (int, optional): dir模式下并行转换的进程数, 1 为串行, 0 为CPU核数. Defaults to 1.
+            cache (bool, optional): 是否根据转换清单跳过未变化的文件. Defaults to True.
+            prefetch_mb (int, optional): dir模式串行转换时预读后续文件的内存上限(MB), 0 为不预读. Defaults to 256.
         """
+        self.project_name: str = project_name
         self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
         self.method: str | None = self.__verify_params(method)
+        self.workers: int = self.__verify_workers(workers)
+        self.cache: bool = cache
+        self.prefetch_mb: int = prefetch_mb
+        # 最近一次 convert_dir 中转换失败的文件
+        self.failed: list[Path] = list()
 
     def __verify_params(self, method: str) -> str | None:
         """检验类的初始化参数是否正确"""
@@ -33,6 +58,17 @@ class ExcelToCsv:
         else:
             return method
 
+    def __verify_workers(self, workers: int) -> int:
+        """检验并行进程数是否正确"""
+
+        if not isinstance(workers, int) or workers < 0:
+            self.logger.error(
+                f"ExcelToCsv类的workers参数必须为非负整数, 当前为: {workers}"
+            )
+            raise ValueError()
+
+        return workers or os.cpu_count() or 1
+
     def path_exists(self, file_path: str) -> Path:
         """判断输入的文件路径是否符合规范或存在
 
@@ -66,16 +102,27 @@ class ExcelToCsv:
         path: Path,
         output_dir: Path | None = None,
         encoding: str = "utf-8",
+        chunk_size: int = 5_000,
+        progress: bool = True,
+        source: io.BytesIO | None = None,
+        manifest: ConversionManifest | None = None,
     ) -> Path | None:
-        """读取Excel文件, 将文件转化为csv文件
+        """读取Excel文件, 将文件流式转化为csv文件
+
+        xlsx 文件以只读模式逐行读取, 每累计 chunk_size 行写入一次 csv,
+        内存占用只与 chunk_size 有关, 与文件大小无关.
 
         Args:
             path (Path): 带转换的文件路径.
+            output_dir (Path | None, optional): dir模式下csv文件的保存文件夹. Defaults to None.
             encoding (str, optional): 文件的编码格式. Defaults to "utf-8".
-            index (bool, optional): 是否保留索引. Defaults to False.
+            chunk_size (int, optional): 每批写入的行数. Defaults to 5_000.
+            progress (bool, optional): 是否显示写入进度条. Defaults to True.
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
+            manifest (ConversionManifest | None, optional): 批量转换共用的转换清单, None 时单独读写 csv 所在文件夹的清单. Defaults to None.
 
         Returns:
-            Path | None: csv文件lujing或者空值.
+            Path | None: csv文件路径或者空值.
         """
 
         if path.suffix == ".csv":
@@ -92,35 +139,285 @@ class ExcelToCsv:
                 raise ValueError()
             csv_path = output_dir / f"{path.stem}.csv"
 
-        self.logger.info(f"\n--读取 '{path.name}' --")
-        with alive_bar(title=f"读取 '{path.name}' ", spinner="waves") as bar:
-            start_time: float = time.time()
+        if self.cache and manifest is None:
+            manifest = ConversionManifest(csv_path.parent, self.project_name)
+        if manifest is not None:
+            if manifest.is_fresh(path, csv_path, "csv"):
+                self.logger.info(f"'{path.name}' 未发生变化, 跳过转换")
+                return csv_path
 
-            df_excel: pd.DataFrame = pd.read_excel(path)
+        self.logger.info(f"\n-- 转换 '{path.name}' --")
 
-            elapsed = time.time() - start_time
+        with StageProfiler(f"转换 '{path.name}'", self.project_name) as prof:
+            if path.suffix in [".xlsx", ".xlsm"]:
+                max_row, max_col = self.__stream_xlsx(
+                    source or path, csv_path, encoding, chunk_size, progress
+                )
+            else:
+                # openpyxl 不支持 xls 格式, 只能整表读取
+                max_row, max_col = self.__chunk_xls(
+                    source or path, csv_path, encoding, chunk_size, progress
+                )
+            prof.rows_out = max_row
 
         self.logger.info(
-            f"读取完成! 耗时: {elapsed:.2f}秒 |"
-            f"行数: {df_excel.shape[0]:: ,} , 列数: {df_excel.shape[1]: ,}"
+            f"\n-- {path.name}转换完成 -- 行数: {max_row: ,} , 列数: {max_col: ,}"
         )
 
-        self.logger.info(f"\n-- 转换 '{path.name}' --")
+        if manifest is not None:
+            manifest.record(
+                path,
+                csv_path,
+                "csv",
+                schema=self.csv_header(csv_path),
+                sha256=(
+                    ConversionManifest.buffer_hash(source)
+                    if source is not None
+                    else None
+                ),
+            )
+
+        return csv_path
+
+    @staticmethod
+    def csv_header(csv_path: Path, encoding: str = "utf-8") -> list[str]:
+        """读取csv文件的表头"""
 
-        chunk_size: int = 5_000
+        with open(csv_path, "r", newline="", encoding=encoding) as f:
+            return next(csv.reader(f), [])
+
+    @staticmethod
+    def __header(row: tuple) -> list[str]:
+        """按照 pandas 的规则处理表头: 空列名记为 'Unnamed: i', 重复列名追加序号"""
+
+        header: list[str] = list()
+        seen: dict[str, int] = dict()
+        for i, name in enumerate(row):
+            name = f"Unnamed: {i}" if name is None else str(name)
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            seen.setdefault(name, 0)
+            header.append(name)
+
+        return header
+
+    def __stream_xlsx(
+        self,
+        path: Path | io.BytesIO,
+        csv_path: Path,
+        encoding: str,
+        chunk_size: int,
+        progress: bool,
+    ) -> tuple[int, int]:
+        """以只读模式逐行读取xlsx文件, 分批写入csv文件
+
+        Returns:
+            tuple[int, int]: 写入的行数, 列数
+        """
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            rows = ws.iter_rows(values_only=True)
+
+            header: list[str] = self.__header(next(rows, ()))
+            max_col: int = len(header)
+            max_row: int = 0
+            batch: list[tuple] = list()
+            blank: list[tuple] = list()  # 暂存空行, 末尾的空行不写入
+
+            with open(csv_path, "w", newline="", encoding=encoding) as f, tqdm(
+                total=max(ws.max_row - 1, 0) if ws.max_row else None,
+                desc="写入进度",
+                unit="行",
+                disable=not progress,
+            ) as bar:
+                writer = csv.writer(f)
+                writer.writerow(header)
+
+                for row in rows:
+                    row = row[:max_col] + (None,) * (max_col - len(row))
+                    if all(v is None for v in row):
+                        blank.append(row)
+                        continue
+
+                    batch.extend(blank)
+                    batch.append(row)
+                    blank.clear()
+
+                    if len(batch) >= chunk_size:
+                        writer.writerows(batch)
+                        max_row += len(batch)
+                        bar.update(len(batch))
+                        batch.clear()
+
+                writer.writerows(batch)
+                max_row += len(batch)
+                bar.update(len(batch))
+        finally:
+            wb.close()
+
+        return max_row, max_col
+
+    def __chunk_xls(
+        self,
+        path: Path | io.BytesIO,
+        csv_path: Path,
+        encoding: str,
+        chunk_size: int,
+        progress: bool,
+    ) -> tuple[int, int]:
+        """整表读取xls文件, 分块写入csv文件
+
+        Returns:
+            tuple[int, int]: 写入的行数, 列数
+        """
+
+        df_excel: pd.DataFrame = pd.read_excel(path)
         max_row: int = df_excel.shape[0]
-        max_col: int = df_excel.shape[1]
-        total_chunks: int = (max_row + chunk_size - 1) // chunk_size
 
         with open(csv_path, "w", newline="", encoding=encoding) as f:
-
-            for i in tqdm(range(0, max_row, chunk_size), desc="写入进度", unit="块"):
+            for idx, i in enumerate(
+                tqdm(
+                    range(0, max_row, chunk_size),
+                    desc="写入进度",
+                    unit="块",
+                    disable=not progress,
+                )
+            ):
                 chunk = df_excel.iloc[i : i + chunk_size]
-                chunk.to_csv(f, index=False, encoding=encoding)
+                # 只有第一个 chunk 写入 header，避免表头重复
+                chunk.to_csv(f, index=False, header=(idx == 0))
 
-        self.logger.info(f"\n-- {path.name}转换完成 --")
+            if max_row == 0:
+                df_excel.to_csv(f, index=False)
 
-        return csv_path
+        return max_row, df_excel.shape[1]
+
+    def convert_dir(self, input_dir: Path, output_dir: Path) -> list[Path]:
+        """转换文件夹下的全部Excel文件
+
+        workers 大于 1 时使用进程池并行转换. 单个文件转换失败只记录日志, 不会中断整个批次,
+        失败的文件保存在 failed 属性中. 返回的csv路径按照源文件名排序, 与并行完成的先后顺序无关.
+
+        Args:
+            input_dir (Path): 待转换的Excel文件夹路径
+            output_dir (Path): 保存csv文件的文件夹路径
+
+        Returns:
+            list[Path]: csv文件路径
+        """
+
+        # 按文件大小从大到小排列, 并行时先提交大文件, 避免最后只剩一个大文件在转换
+        path_list: list[Path] = [
+            f.path
+            for f in PathReading(self.project_name, method="excel").scan(
+                input_dir,
+                recursive=False,
+                suffixes=(".xlsx", ".xlsm", ".xls"),
+                order="size",
+            )
+        ]
+        results: dict[Path, Path | None] = dict()
+        failed: list[Path] = list()
+        start_time: float = time.time()
+
+        # 转换清单只在主进程读写, 未变化的文件不再转换和预读.
+        # 清单在批次结束(或中断)时写入一次, 不在每个文件转换后重写
+        manifest: ConversionManifest | None = None
+        pending: list[Path] = path_list
+        if self.cache:
+            manifest = ConversionManifest(output_dir, self.project_name, autosave=False)
+            pending = list()
+            for p in path_list:
+                target: Path = output_dir / f"{p.stem}.csv"
+                if manifest.is_fresh(p, target, "csv"):
+                    self.logger.info(f"'{p.name}' 未发生变化, 跳过转换")
+                    results[p] = target
+                else:
+                    pending.append(p)
+
+        try:
+            if self.workers == 1 or len(pending) <= 1:
+                # 转换当前文件时后台预读后续文件
+                with FilePrefetcher(
+                    pending, self.prefetch_mb * 1024**2, self.project_name
+                ) as prefetcher:
+                    for p, source in prefetcher:
+                        try:
+                            results[p] = self.to_csv(
+                                p,
+                                output_dir=output_dir,
+                                source=source,
+                                manifest=manifest,
+                            )
+                        except Exception as e:
+                            self.logger.error(f"'{p.name}' 转换失败: {e!r}")
+                            failed.append(p)
+
+            else:
+                workers: int = max(min(self.workers, len(pending)), 1)
+                self.logger.info(
+                    f"使用 {workers} 个进程并行转换 {len(pending)} 个文件."
+                )
+
+                with ProcessPoolExecutor(
+                    max_workers=workers, **LogConfig.pool_kwargs(self.project_name)
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            _convert_worker,
+                            p,
+                            output_dir,
+                            self.method,
+                            self.project_name,
+                        ): p
+                        for p in pending
+                    }
+                    for future in tqdm(
+                        as_completed(futures),
+                        total=len(futures),
+                        desc="转换进度",
+                        unit="个",
+                    ):
+                        p = futures[future]
+                        try:
+                            results[p], sha256, elapsed = future.result()
+                        except Exception as e:
+                            self.logger.error(f"'{p.name}' 转换失败: {e!r}")
+                            failed.append(p)
+                            continue
+                        self.logger.info(f"'{p.name}' 转换完成, 耗时: {elapsed:.2f}秒")
+
+                        done_path: Path | None = results[p]
+                        if manifest is not None and done_path is not None:
+                            manifest.record(
+                                p,
+                                done_path,
+                                "csv",
+                                schema=self.csv_header(done_path),
+                                sha256=sha256,
+                            )
+        finally:
+            if manifest is not None:
+                manifest.flush()
+
+        csv_list: list[Path] = [
+            csv_path
+            for p in sorted(path_list)
+            if (csv_path := results.get(p)) is not None
+        ]
+
+        self.logger.info(
+            f"得到{len(csv_list)}个csv文件, 失败{len(failed)}个, "
+            f"总耗时: {time.time() - start_time:.2f}秒."
+        )
+        self.failed = sorted(failed)
+        if failed:
+            self.logger.warning(f"转换失败的文件: {[p.name for p in self.failed]}")
+
+        return csv_list
 
     def __dir_pattern(self) -> list[Path]:
         """dir模式
@@ -138,16 +435,7 @@ class ExcelToCsv:
             input("请输入保存Csv文件的文件夹路径: \t").strip().strip("'").strip('"')
         )
 
-        csv_list: list[Path] = list()
-
-        for p in input_dir.iterdir():
-            csv_path: Path | None = self.to_csv(p, output_dir=output_dir)
-            if csv_path:
-                csv_list.append(csv_path)
-
-        self.logger.info(f"成功转换{len(csv_list)}个文件.")
-
-        return csv_list
+        return self.convert_dir(input_dir, output_dir)
 
     def __file_pattern(self) -> Path:
         """file模式
@@ -187,3 +475,25 @@ class ExcelToCsv:
             result: Path = self.__file_pattern()
             self.logger.info("\n----ExcelToCsv模块-结束----")
             return result
+
+
+def _convert_worker(
+    path: Path, output_dir: Path, method: str, project_name: str
+) -> tuple[Path | None, str, float]:
+    """进程池中转换单个文件, 需要定义在模块顶层才能被子进程导入
+
+    源文件的哈希值也在子进程中计算, 主进程记录转换清单时不必再读取一遍源文件.
+
+    Returns:
+        tuple[Path | None, str, float]: csv文件路径, 源文件的 sha256, 转换耗时
+    """
+
+    start_time: float = time.time()
+    exceltocsv: ExcelToCsv = ExcelToCsv(
+        project_name=project_name, method=method, cache=False
+    )
+    csv_path: Path | None = exceltocsv.to_csv(
+        path, output_dir=output_dir, progress=False
+    )
+
+    return csv_path, ConversionManifest.file_hash(path), time.time() - start_time
@@ -1,26 +1,73 @@
+import io
 import logging
-import time
+import os
+import re
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 from alive_progress import alive_bar
+from concurrent.futures import Future
 from pathlib import Path
 from tqdm import tqdm
+from typing import TYPE_CHECKING
+
+from .ConversionManifest import ConversionManifest
+from .ExcelExport import ExcelExport
+from .FilePathReading import PathReading
+from .FilePrefetch import BackgroundWriter, FilePrefetcher
+from .StageProfiler import StageProfiler
+
+if TYPE_CHECKING:
+    from .ParquetStore import ParquetStore
 
 
 class DataCvs:
     """数据转换类"""
 
-    def __init__(self, project_name: str = "DataCvs", method: str = "dir"):
+    # parquet 支持的压缩格式
+    compressions: tuple[str, ...] = ("snappy", "gzip", "brotli", "zstd", "lz4", "none")
+    # csv 流式转换时每次读取的字节数
+    block_size: int = 4 * 1024**2
+
+    def __init__(
+        self,
+        project_name: str = "DataCvs",
+        method: str = "dir",
+        cache: bool = True,
+        prefetch_mb: int = 256,
+        compression: str = "snappy",
+        row_group_size: int = 250_000,
+        sample_mb: int = 4,
+        column_types: dict[str, str] | None = None,
+    ):
         """初始化 DataCvs 类实例
 
         Args:
             project_name (str, optional): 项目名称. Defaults to "DataCvs".
             method (str, optional): {"dir", "file"}.该类的转换模式. Defaults to "dir".
+            cache (bool, optional): 是否根据转换清单跳过未变化的文件. Defaults to True.
+            prefetch_mb (int, optional): 预读后续文件和排队写入的内存上限(MB), 0 为不预读. Defaults to 256.
+            compression (str, optional): parquet 的压缩格式, 参数值有: "snappy", "gzip", "brotli", "zstd", "lz4", "none". Defaults to "snappy".
+            row_group_size (int, optional): parquet 每个行组的行数, csv 流式转换时内存占用主要由该值决定. Defaults to 250_000.
+            sample_mb (int, optional): csv 流式转换时用于推断列类型的文件开头样本大小(MB). Defaults to 4.
+            column_types (dict[str, str] | None, optional): csv 流式转换时指定的列类型, 覆盖样本推断的类型, 例如 {"揽收网点代码": "string"}. Defaults to None.
         """
 
+        self.project_name: str = project_name
+        self.cache: bool = cache
+        self.prefetch_mb: int = prefetch_mb
         self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
         self.method: str = self.__verify_params(method)
         self.dtype: list[str] = ["xlsx", "csv", "parquet"]
+        self.compression: str = self.__verify_compression(compression)
+        self.row_group_size: int = max(row_group_size, 1)
+        self.sample_mb: int = max(sample_mb, 1)
+        self.column_types: dict[str, pa.DataType] = self.__verify_column_types(
+            column_types or dict()
+        )
 
     def __verify_params(self, method: str) -> str:
         """检验类的初始化参数是否正确"""
@@ -34,6 +81,33 @@ class DataCvs:
         else:
             return method
 
+    def __verify_compression(self, compression: str) -> str:
+        """检验 compression 参数是否正确"""
+
+        if compression not in self.compressions:
+            self.logger.error(
+                f"DataCvs类的compression参数没有{compression}值, "
+                f"compression参数值有: {', '.join(self.compressions)}."
+            )
+            raise ValueError()
+
+        return compression
+
+    def __verify_column_types(
+        self, column_types: dict[str, str]
+    ) -> dict[str, pa.DataType]:
+        """将指定的列类型名称转换为 Arrow 类型, 例如 "string", "int64", "float64", "timestamp[s]" """
+
+        types: dict[str, pa.DataType] = dict()
+        for col, alias in column_types.items():
+            try:
+                types[col] = pa.type_for_alias(alias)
+            except ValueError:
+                self.logger.error(f"列 '{col}' 指定的类型 '{alias}' 无法识别")
+                raise ValueError()
+
+        return types
+
     def path_exists(self, file_path: str) -> Path:
         """判断输入的文件路径是否符合规范或存在
 
@@ -65,12 +139,22 @@ class DataCvs:
 
         return path
 
-    def __data_read(self, path: Path, dtype: str) -> pd.DataFrame:
+    def __path_list(self, path: Path, dtype: str) -> list[Path]:
+        """一次遍历文件夹(含子文件夹), 读取指定类型的文件路径, 忽略 Excel 锁文件"""
+
+        return PathReading(self.project_name).path_reading(
+            path, suffixes=(f".{dtype}",)
+        )
+
+    def __data_read(
+        self, path: Path, dtype: str, source: io.BytesIO | None = None
+    ) -> pd.DataFrame:
         """读取数据文件
 
         Args:
             path (Path): 文件路径
             dtype (str): 文件类型
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
 
         Returns:
             pd.DataFrame: 读取的数据表
@@ -82,33 +166,33 @@ class DataCvs:
             raise ValueError()
 
         self.logger.info(f"\n--读取 '{path.name}' --")
-        with alive_bar(title=f"读取 '{path.name}' ", spinner="waves") as bar:
-            start_time: float = time.time()
-
-            # 读取 excel 文件
-            if dtype == "xlsx":
-                df: pd.DataFrame = pd.read_excel(path)
-            # 读取 csv 文件
-            elif dtype == "csv":
-                df: pd.DataFrame = pd.read_csv(path)
-            # 读取 parquet 文件
-            elif dtype == "parquet":
-                df: pd.DataFrame = pd.read_parquet(path)
-
-            bar()  # 更新进度条
-
-            end_time: float = time.time()
-        # 读取过程耗时
-        elapsed: float = end_time - start_time
-        self.logger.info(
-            f"读取完成! 耗时: {elapsed:.2f}秒 |"
-            f"行数: {df.shape[0]: ,} , 列数: {df.shape[1]: ,}"
-        )
+        data: Path | io.BytesIO = source if source is not None else path
+        with StageProfiler(f"读取 '{path.name}'", self.project_name) as prof:
+            with alive_bar(title=f"读取 '{path.name}' ", spinner="waves") as bar:
+                # 读取 excel 文件
+                if dtype == "xlsx":
+                    df: pd.DataFrame = pd.read_excel(data)
+                # 读取 csv 文件
+                elif dtype == "csv":
+                    df: pd.DataFrame = pd.read_csv(data)
+                # 读取 parquet 文件
+                elif dtype == "parquet":
+                    df: pd.DataFrame = pd.read_parquet(data)
+
+                bar()  # 更新进度条
+            prof.rows_out = df.shape[0]
+
+        self.logger.info(f"读取完成! 行数: {df.shape[0]: ,} , 列数: {df.shape[1]: ,}")
 
         return df
 
     def __conversion(
-        self, df: pd.DataFrame, cvsdtype: str, path: Path, encoding: str = "utf-8"
+        self,
+        df: pd.DataFrame,
+        cvsdtype: str,
+        path: Path,
+        encoding: str = "utf-8",
+        progress: bool = True,
     ) -> Path | None:
         """转换数据
 
@@ -117,6 +201,7 @@ class DataCvs:
             cvsdtype (str): 需要转换成为的文件类型
             path (Path): 读取的文件路径
             encoding (str): 文件编码格式. Defaults to "utf-8"
+            progress (bool, optional): 是否显示写入进度条. Defaults to True.
 
         Returns:
             Path | None: 转换后的文件路径 | None
@@ -130,11 +215,6 @@ class DataCvs:
 
         conver_path: Path = path.with_suffix(f".{cvsdtype}")
 
-        # 判断是否已经转换
-        if conver_path.exists():
-            self.logger.info(f"'{path.name}' 已经转换为 '{conver_path.name}', 跳过")
-            return None
-
         # 设置参数
         chunk_size: int = 5_000  # 数据块大小
         max_row: int = df.shape[0]  # 最大行数
@@ -142,41 +222,273 @@ class DataCvs:
         self.logger.info(f"开始写入 '{conver_path.name}.'")
         # 转换并输出:
         if cvsdtype == "xlsx":
-            with pd.ExcelWriter(conver_path, engine="openpyxl") as writer:
-                start_row = 0
-                for idx, i in enumerate(
-                    tqdm(range(0, max_row, chunk_size), desc="写入进度", unit="块")
-                ):
-                    chunk: pd.DataFrame = df.iloc[i : i + chunk_size]
-                    # header 只在第一个 chunk 写入，startrow 控制写入位置避免覆盖
-                    chunk.to_excel(
-                        writer, index=False, header=(idx == 0), startrow=start_row
-                    )
-                    start_row += len(chunk)
+            # 只写模式流式写入, 超过Excel行数上限时自动拆分工作表
+            excelexport = ExcelExport(self.project_name, chunk_size=chunk_size)
+            excelexport.to_excel(df, conver_path, progress=progress)
 
         elif cvsdtype == "csv":
             with open(conver_path, mode="w", encoding=encoding, newline="") as f:
                 for idx, i in enumerate(
-                    tqdm(range(0, max_row, chunk_size), desc="写入进度", unit="块")
+                    tqdm(
+                        range(0, max_row, chunk_size),
+                        desc="写入进度",
+                        unit="块",
+                        disable=not progress,
+                    )
                 ):
                     chunk: pd.DataFrame = df.iloc[i : i + chunk_size]
                     # 只有第一个 chunk 写入 header，避免表头重复
                     chunk.to_csv(f, index=False, header=(idx == 0))
 
         elif cvsdtype == "parquet":
-            with open(conver_path, mode="wb") as f:
-                start_time: float = time.time()  # 开始时间
-
-                df.to_parquet(conver_path, engine="pyarrow")
-
-                end_time: float = time.time()  # 结束时间
-                # 打印写入耗时
-                print(f"{conver_path.name}写入耗时: {end_time-start_time}.")
+            with StageProfiler(
+                f"写入 '{conver_path.name}'", self.project_name, rows_in=max_row
+            ):
+                df.to_parquet(
+                    conver_path,
+                    engine="pyarrow",
+                    compression=(
+                        None if self.compression == "none" else self.compression
+                    ),
+                    row_group_size=self.row_group_size,
+                )
 
         self.logger.info(f"'{conver_path.name}' 写入完成.")
 
         return conver_path
 
+    def __infer_schema(self, path: Path, source: io.BytesIO | None = None) -> pa.Schema:
+        """按文件开头的样本推断 csv 的列类型, 再用 column_types 覆盖指定列的类型
+
+        与原来经过 pandas 转换的结果保持一致, 时间, 日期列不推断类型, 保存为字符串,
+        需要时间类型时通过 column_types 指定.
+        """
+
+        reader = pacsv.open_csv(
+            source if source is not None else path,
+            read_options=pacsv.ReadOptions(block_size=self.sample_mb * 1024**2),
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+        )
+        schema: pa.Schema = reader.schema
+        reader.close()
+        if source is not None:
+            source.seek(0)
+
+        for idx, field in enumerate(schema):
+            if pa.types.is_temporal(field.type):
+                schema = schema.set(idx, pa.field(field.name, pa.string()))
+
+        for col, col_type in self.column_types.items():
+            idx: int = schema.get_field_index(col)
+            if idx < 0:
+                self.logger.warning(f"'{path.name}' 中没有指定类型的列 '{col}'")
+                continue
+            schema = schema.set(idx, pa.field(col, col_type))
+
+        return schema
+
+    def __widen(self, schema: pa.Schema, error: pa.ArrowInvalid) -> pa.Schema | None:
+        """按转换错误放宽出错列的类型: 整数列遇到小数时改为浮点, 其余改为字符串
+
+        Returns:
+            pa.Schema | None: 放宽后的列类型, 无法识别出错列或该列已是字符串时为 None
+        """
+
+        match = re.search(r"CSV column #(\d+).*invalid value '(.*)'", str(error))
+        if match is None:
+            return None
+
+        idx: int = int(match.group(1))
+        field: pa.Field = schema.field(idx)
+        if pa.types.is_string(field.type):
+            return None
+
+        new_type: pa.DataType = pa.string()
+        if pa.types.is_integer(field.type):
+            try:
+                float(match.group(2))
+                new_type = pa.float64()
+            except ValueError:
+                pass
+
+        self.logger.warning(
+            f"列 '{field.name}' 的数据与样本推断的类型 {field.type} 不一致"
+            f"(值: '{match.group(2)}'), 改为 {new_type} 重新转换. "
+            f"可通过 column_types 直接指定该列的类型"
+        )
+
+        return schema.set(idx, pa.field(field.name, new_type))
+
+    def __scan_types(
+        self, path: Path, source: io.BytesIO | None, schema: pa.Schema
+    ) -> pa.Schema:
+        """读取一遍全部数据, 一次放宽所有与推断类型不一致的列, 避免每放宽一列就重新解析整个文件
+
+        非字符串列先按字符串读取, 再逐批转换为推断的类型, 转换失败的列按 __widen 的规则放宽.
+
+        Returns:
+            pa.Schema: 放宽后的列类型
+        """
+
+        col_types: dict[str, pa.DataType] = {
+            field.name: field.type
+            for field in schema
+            if not pa.types.is_string(field.type)
+        }
+        if source is not None:
+            source.seek(0)
+
+        reader = pacsv.open_csv(
+            source if source is not None else path,
+            read_options=pacsv.ReadOptions(
+                block_size=self.block_size, use_threads=True
+            ),
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.string() for col in col_types},
+                strings_can_be_null=True,
+            ),
+        )
+        for batch in reader:
+            for col, col_type in col_types.items():
+                if pa.types.is_string(col_type):
+                    continue
+                column: pa.Array = batch.column(col)
+                try:
+                    pc.cast(column, col_type)
+                    continue
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    pass
+
+                new_type: pa.DataType = pa.string()
+                if pa.types.is_integer(col_type):
+                    try:
+                        pc.cast(column, pa.float64())
+                        new_type = pa.float64()
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                        pass
+                col_types[col] = new_type
+        reader.close()
+
+        for idx, field in enumerate(schema):
+            new_type = col_types.get(field.name, field.type)
+            if new_type != field.type:
+                self.logger.warning(
+                    f"列 '{field.name}' 的数据与样本推断的类型 {field.type} 不一致, "
+                    f"改为 {new_type}. 可通过 column_types 直接指定该列的类型"
+                )
+                schema = schema.set(idx, pa.field(field.name, new_type))
+
+        return schema
+
+    def __write_parquet(
+        self,
+        path: Path,
+        source: io.BytesIO | None,
+        schema: pa.Schema,
+        tmp_path: Path,
+    ) -> int:
+        """按指定的列类型流式写入一次 parquet, 返回写入的行数"""
+
+        budget: int = max(self.prefetch_mb, 1) * 1024**2
+        if source is not None:
+            source.seek(0)
+
+        n_written: int = 0
+        with pq.ParquetWriter(
+            tmp_path, schema, compression=self.compression
+        ) as pq_writer, BackgroundWriter(budget, self.project_name) as writer:
+            reader = pacsv.open_csv(
+                source if source is not None else path,
+                read_options=pacsv.ReadOptions(
+                    block_size=self.block_size, use_threads=True
+                ),
+                convert_options=pacsv.ConvertOptions(
+                    column_types=schema, strings_can_be_null=True
+                ),
+            )
+            batches: list[pa.RecordBatch] = list()
+            n_rows: int = 0
+            for batch in reader:
+                batches.append(batch)
+                n_rows += batch.num_rows
+                if n_rows < self.row_group_size:
+                    continue
+                # 凑满的行组交给写入线程, 剩余的行留到下一个行组
+                table: pa.Table = pa.Table.from_batches(batches, schema=schema)
+                n_full: int = n_rows // self.row_group_size * self.row_group_size
+                full: pa.Table = table.slice(0, n_full)
+                writer.submit(
+                    pq_writer.write_table,
+                    full,
+                    row_group_size=self.row_group_size,
+                    nbytes=full.nbytes,
+                )
+                batches = table.slice(n_full).to_batches()
+                n_rows -= n_full
+                n_written += n_full
+            if n_rows:
+                writer.submit(
+                    pq_writer.write_table,
+                    pa.Table.from_batches(batches, schema=schema),
+                    row_group_size=self.row_group_size,
+                )
+                n_written += n_rows
+
+        return n_written
+
+    def __stream_parquet(
+        self, path: Path, source: io.BytesIO | None = None
+    ) -> tuple[Path, dict[str, str]]:
+        """csv 按记录批次读取, 逐个行组写入 parquet, 内存占用只与行组大小有关
+
+        csv 由 Arrow 多线程解析, 行组的压缩和写入在后台线程中进行, 与后续批次的解析重叠.
+        样本之后的数据与推断的类型不一致时, 先读取一遍全部数据放宽所有不一致的列, 再重新转换.
+
+        Args:
+            path (Path): csv 文件路径
+            source (io.BytesIO | None, optional): 已读入内存的文件内容, None 时从 path 读取. Defaults to None.
+
+        Returns:
+            tuple[Path, dict[str, str]]: 转换后的文件路径和列类型
+        """
+
+        conver_path: Path = path.with_suffix(".parquet")
+        tmp_path: Path = conver_path.with_name(f"{conver_path.name}.tmp")
+        schema: pa.Schema = self.__infer_schema(path, source)
+
+        self.logger.info(f"开始流式写入 '{conver_path.name}'.")
+        with StageProfiler(f"流式转换 '{path.name}'", self.project_name) as prof:
+            scanned: bool = False
+            while True:
+                try:
+                    prof.rows_out = self.__write_parquet(path, source, schema, tmp_path)
+                    break
+                except pa.ArrowInvalid as e:
+                    tmp_path.unlink(missing_ok=True)
+                    if not scanned:
+                        self.logger.warning(
+                            f"'{path.name}' 的数据与样本推断的类型不一致, 检查全部数据: {e}"
+                        )
+                        schema = self.__scan_types(path, source, schema)
+                        scanned = True
+                        continue
+                    # 全部数据检查后仍然出错时, 逐个放宽出错的列
+                    widened: pa.Schema | None = self.__widen(schema, e)
+                    if widened is None:
+                        self.logger.error(f"'{path.name}' 转换失败: {e}")
+                        raise ValueError()
+                    schema = widened
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+
+        os.replace(tmp_path, conver_path)
+        self.logger.info(
+            f"'{conver_path.name}' 写入完成. 行数: {prof.rows_out: ,} , 列数: {len(schema): ,}"
+        )
+
+        return conver_path, {field.name: str(field.type) for field in schema}
+
     def __process(
         self, path: Path, dtype: str = "xlsx", cvsdtype: str = "parquet"
     ) -> list[Path]:
@@ -187,7 +499,7 @@ class DataCvs:
             dtype (str , optional): {"xlsx", "csv", "parquet"}.待转换文件格式. Defaults to "xlsx".
             cvsdtype (str , optional): {"xlsx", "csv", "parquet"}.转换后文件格式. Defaults to "parquet".
         Returns:
-            list[Path]: 成功转换的数据路径列表
+            list[Path]: 转换后的数据路径列表, 包含未变化而跳过的文件
         """
 
         if dtype not in self.dtype:
@@ -195,29 +507,184 @@ class DataCvs:
                 "输入的文件类型不符合要求, 请输入: xlsx, csv, parquet 中的一种"
             )
             raise ValueError()
+        if dtype == cvsdtype:
+            self.logger.error(f"待转换格式和转换后格式相同: {dtype}, 无需转换")
+            raise ValueError()
         # 返回的数据字典
         res_list: list[Path] = list()
+        skipped: list[Path] = list()
 
         # dir-文件夹模式
         if self.method == "dir":
             # 遍历指定类型的文件
-            path_list = [p for p in path.rglob(f"*.{dtype}")]
+            path_list = self.__path_list(path, dtype)
             self.logger.info(f"一共读取到: {len(path_list)} 个文件.")
-            # 读取文件数据
+            manifest_dir: Path = path
+        # file-文件模式
+        elif self.method == "file":
+            path_list = [path]
+            manifest_dir: Path = path.parent
+
+        manifest: ConversionManifest | None = None
+        if self.cache:
+            # 清单在全部文件转换完成(或中断)后写入一次
+            manifest = ConversionManifest(
+                manifest_dir, self.project_name, autosave=False
+            )
+
+        jobs: list[tuple[Path, dict[str, str], str | None, Future | Path]] = list()
+        try:
+            pending: list[Path] = list()
             for p in path_list:
-                df: pd.DataFrame = self.__data_read(p, dtype)
-                conver_path: Path | None = self.__conversion(df, cvsdtype, p)
-                if conver_path:
-                    res_list.append(conver_path)
+                # 判断源文件自上次转换后是否变化
+                conver_path: Path = p.with_suffix(f".{cvsdtype}")
+                if manifest is not None and manifest.is_fresh(p, conver_path, cvsdtype):
+                    self.logger.info(f"'{p.name}' 未发生变化, 跳过")
+                    skipped.append(conver_path)
+                    continue
+                pending.append(p)
+
+            # 读取当前文件时后台预读后续文件, 写入与下一个文件的读取重叠
+            budget: int = self.prefetch_mb * 1024**2
+            with FilePrefetcher(
+                pending, budget, self.project_name
+            ) as prefetcher, BackgroundWriter(budget, self.project_name) as writer:
+                for p, source in prefetcher:
+                    sha256: str | None = None
+                    if manifest is not None and source is not None:
+                        sha256 = ConversionManifest.buffer_hash(source)
+
+                    # csv 转 parquet 不读入整表, 按批次流式转换
+                    if dtype == "csv" and cvsdtype == "parquet":
+                        conver_path, schema = self.__stream_parquet(p, source)
+                        jobs.append((p, schema, sha256, conver_path))
+                        continue
+
+                    # 读取文件数据
+                    df: pd.DataFrame = self.__data_read(p, dtype, source)
+                    schema: dict[str, str] = {
+                        str(col): str(t) for col, t in df.dtypes.items()
+                    }
+                    # 写入线程中不显示进度条, 避免与读取的进度条混在一起
+                    future: Future = writer.submit(
+                        self.__conversion,
+                        df,
+                        cvsdtype,
+                        p,
+                        progress=False,
+                        nbytes=int(df.memory_usage(deep=True).sum()),
+                    )
+                    jobs.append((p, schema, sha256, future))
+        finally:
+            # 退出 BackgroundWriter 时已等待全部写入结束. 某个文件写入失败或中断时,
+            # 已完成的文件仍然记录进清单, 下次运行不必重新转换; 写入异常在记录后抛出
+            for p, schema, sha256, result in jobs:
+                if isinstance(result, Future):
+                    if (
+                        not result.done()
+                        or result.cancelled()
+                        or result.exception() is not None
+                    ):
+                        continue
+                    result = result.result()
+                if result:
+                    res_list.append(result)
+                    if manifest is not None:
+                        manifest.record(
+                            p, result, cvsdtype, schema=schema, sha256=sha256
+                        )
+            if manifest is not None:
+                manifest.flush()
 
-            self.logger.info(f"成功转换: {len(res_list)} 个文件.")
+        if self.method == "dir":
+            self.logger.info(
+                f"成功转换: {len(res_list)} 个文件, 未变化跳过: {len(skipped)} 个文件."
+            )
 
-        # file-文件模式
+        return skipped + res_list
+
+    def convert(
+        self, path: Path, dtype: str = "xlsx", cvsdtype: str = "parquet"
+    ) -> list[Path]:
+        """不经过交互输入直接转换文件/文件夹
+
+        Args:
+            path (Path): 读取的文件/文件夹路径
+            dtype (str , optional): {"xlsx", "csv", "parquet"}.待转换文件格式. Defaults to "xlsx".
+            cvsdtype (str , optional): {"xlsx", "csv", "parquet"}.转换后文件格式. Defaults to "parquet".
+
+        Returns:
+            list[Path]: 转换后的数据路径列表, 包含未变化而跳过的文件
+        """
+
+        return self.__process(path, dtype=dtype, cvsdtype=cvsdtype)
+
+    def ingest(
+        self,
+        path: Path,
+        store: "ParquetStore",
+        report: str,
+        dtype: str = "xlsx",
+        date_col: str | None = None,
+    ) -> list[Path]:
+        """将源数据文件写入 Parquet 数据仓库, 已写入且未变化的文件直接跳过
+
+        Args:
+            path (Path): 读取的文件/文件夹路径
+            store (ParquetStore): 数据仓库
+            report (str): 报表类型
+            dtype (str, optional): {"xlsx", "csv", "parquet"}.源文件格式. Defaults to "xlsx".
+            date_col (str | None, optional): 按该列拆分日期分区, None 时从文件名识别日期. Defaults to None.
+
+        Returns:
+            list[Path]: 写入的分区文件路径, 每个源文件在每个日期分区中写入一个文件
+        """
+
+        if self.method == "dir":
+            path_list: list[Path] = self.__path_list(path, dtype)
+            self.logger.info(f"一共读取到: {len(path_list)} 个文件.")
         elif self.method == "file":
-            df: pd.DataFrame = self.__data_read(path, dtype)
-            conver_path: Path | None = self.__conversion(df, cvsdtype, path)
-            if conver_path:
-                res_list.append(conver_path)
+            path_list = [path]
+
+        manifest: ConversionManifest | None = None
+        target: Path = store.report_dir(report)
+        if self.cache:
+            manifest = ConversionManifest(store.root, self.project_name, autosave=False)
+
+        res_list: list[Path] = list()
+        try:
+            for p in path_list:
+                if manifest is not None and manifest.is_fresh(
+                    p, target, f"store:{report}"
+                ):
+                    self.logger.info(f"'{p.name}' 未发生变化, 跳过")
+                    continue
+
+                day = None
+                if date_col is None:
+                    day = store.date_from_name(p.name)
+                    if day is None:
+                        self.logger.error(f"无法从文件名 '{p.name}' 中识别日期, 跳过")
+                        continue
+
+                df: pd.DataFrame = self.__data_read(p, dtype)
+                # 按源文件写入单独的分区文件, 同一日期的多个源文件不会互相覆盖
+                res_list.extend(
+                    store.ingest(
+                        df, report, day=day, date_col=date_col, source=str(p.resolve())
+                    )
+                )
+
+                if manifest is not None:
+                    schema: dict[str, str] = {
+                        str(col): str(t) for col, t in df.dtypes.items()
+                    }
+                    manifest.record(p, target, f"store:{report}", schema=schema)
+        finally:
+            if manifest is not None:
+                manifest.flush()
+
+        self.logger.info(f"成功写入: {len(res_list)} 个分区.")
 
         return res_list
 
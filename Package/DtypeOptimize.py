@@ -0,0 +1,154 @@
+import logging
+import numpy as np
+import pandas as pd
+
+
+class DtypeOptimize:
+    """压缩数据表的列类型, 减少内存占用
+
+    整数列降为能容纳数据的最小整数类型; 浮点列只在转换为 float32 不损失精度时转换;
+    重复值较多的字符串列转换为类别列, 其余字符串列可选转换为 Arrow 字符串.
+    """
+
+    def __init__(
+        self,
+        project_name: str = "DtypeOptimize",
+        category_ratio: float = 0.5,
+        downcast_float: bool = True,
+        string_dtype: str | None = None,
+        exclude: list[str] | None = None,
+    ):
+        """初始化 DtypeOptimize 类实例
+
+        Args:
+            project_name (str, optional): 项目名称. Defaults to "DtypeOptimize".
+            category_ratio (float, optional): 不重复值占比不超过该值的字符串列转换为类别列. Defaults to 0.5.
+            downcast_float (bool, optional): 是否将浮点列无损转换为 float32. 后续参与除法等运算的列转换后结果精度会变化. Defaults to True.
+            string_dtype (str | None, optional): 其余字符串列的类型, 例如 "string[pyarrow]", None 时保持不变. Defaults to None.
+            exclude (list[str] | None, optional): 不转换的列. Defaults to None.
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.category_ratio: float = self.__verify_ratio(category_ratio)
+        self.downcast_float: bool = downcast_float
+        self.string_dtype: str | None = string_dtype
+        self.exclude: set[str] = set(exclude or list())
+        self.report: pd.DataFrame = pd.DataFrame()
+
+    def __verify_ratio(self, category_ratio: float) -> float:
+        """检验 category_ratio 参数是否正确"""
+
+        if not 0 <= category_ratio <= 1:
+            self.logger.error(
+                f"category_ratio参数应在 0 ~ 1 之间, 当前为: {category_ratio}"
+            )
+            raise ValueError()
+
+        return category_ratio
+
+    def __integer(self, s: pd.Series) -> pd.Series:
+        """整数列降为最小的有符号整数类型, 保持减法等运算的结果不变"""
+
+        return pd.to_numeric(s, downcast="integer")
+
+    def __float(self, s: pd.Series) -> pd.Series:
+        """浮点列在 float32 能精确表示全部值时转换"""
+
+        if not self.downcast_float or s.dtype == np.float32:
+            return s
+
+        values: np.ndarray = s.to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(over="ignore"):
+            values_32: np.ndarray = values.astype(np.float32)
+        if np.array_equal(values_32.astype(np.float64), values, equal_nan=True):
+            return s.astype(np.float32)
+
+        return s
+
+    def __string(self, s: pd.Series) -> pd.Series:
+        """字符串列按不重复值占比转换为类别列或指定的字符串类型"""
+
+        # 只转换全部为字符串的列, 日期等对象列保持不变
+        if pd.api.types.infer_dtype(s, skipna=True) != "string":
+            return s
+
+        n_valid: int = int(s.notna().sum())
+        if n_valid and s.nunique(dropna=True) / n_valid <= self.category_ratio:
+            return s.astype("category")
+        if self.string_dtype is not None:
+            return s.astype(self.string_dtype)
+
+        return s
+
+    def optimize(
+        self, df: pd.DataFrame, columns: list[str] | None = None
+    ) -> pd.DataFrame:
+        """压缩数据表的列类型, 每列转换前后的内存占用记录在 report 属性中
+
+        Args:
+            df (pd.DataFrame): 数据表
+            columns (list[str] | None, optional): 需要转换的列, None 时为全部列. Defaults to None.
+
+        Returns:
+            pd.DataFrame: 转换后的数据表, 不修改原表
+        """
+
+        columns = [
+            col
+            for col in (df.columns if columns is None else columns)
+            if col not in self.exclude
+        ]
+        df = df.copy(deep=False)
+        rows: list[dict] = list()
+
+        for col in columns:
+            s: pd.Series = df[col]
+            dtype_before = s.dtype
+
+            if pd.api.types.is_bool_dtype(s) or isinstance(
+                s.dtype, pd.CategoricalDtype
+            ):
+                pass
+            elif pd.api.types.is_integer_dtype(s):
+                s = self.__integer(s)
+            elif pd.api.types.is_float_dtype(s):
+                s = self.__float(s)
+            elif pd.api.types.is_object_dtype(s):
+                s = self.__string(s)
+
+            if s.dtype != dtype_before:
+                rows.append(
+                    {
+                        "列名": col,
+                        "原类型": str(dtype_before),
+                        "新类型": str(s.dtype),
+                        "原内存(MB)": df[col].memory_usage(index=False, deep=True)
+                        / 1024**2,
+                        "新内存(MB)": s.memory_usage(index=False, deep=True) / 1024**2,
+                    }
+                )
+                df[col] = s
+
+        self.report = pd.DataFrame(
+            rows, columns=["列名", "原类型", "新类型", "原内存(MB)", "新内存(MB)"]
+        ).round(2)
+        self.__log()
+
+        return df
+
+    def __log(self) -> None:
+        """输出内存变化的汇总和每列明细"""
+
+        if self.report.empty:
+            self.logger.debug("没有需要压缩类型的列")
+            return
+
+        before: float = self.report["原内存(MB)"].sum()
+        after: float = self.report["新内存(MB)"].sum()
+        self.logger.info(
+            f"压缩了 {len(self.report)} 列的类型, 内存: {before:.2f}MB -> {after:.2f}MB"
+        )
+        for row in self.report.itertuples(index=False, name=None):
+            self.logger.debug(
+                f"{row[0]}: {row[1]} -> {row[2]} | {row[3]:.2f}MB -> {row[4]:.2f}MB"
+            )
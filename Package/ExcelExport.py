@@ -0,0 +1,87 @@
+import logging
+import time
+import pandas as pd
+
+from openpyxl import Workbook
+from pathlib import Path
+from tqdm import tqdm
+
+
+class ExcelExport:
+    """以只写模式流式写入xlsx文件, 内存占用与数据行数无关"""
+
+    # Excel 单个工作表的最大行数(含表头)
+    max_rows: int = 1_048_576
+
+    def __init__(self, project_name: str = "ExcelExport", chunk_size: int = 5_000):
+        """初始化 ExcelExport 类实例
+
+        Args:
+            project_name (str, optional): 项目名称. Defaults to "ExcelExport".
+            chunk_size (int, optional): 每次转换为单元格的行数. Defaults to 5_000.
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.chunk_size: int = chunk_size
+
+    def to_excel(
+        self,
+        df: pd.DataFrame,
+        path: Path,
+        sheet_name: str = "Sheet1",
+        index: bool = False,
+        progress: bool = False,
+    ) -> Path:
+        """写入xlsx文件, 超过Excel行数上限时自动拆分到多个工作表
+
+        拆分后的工作表依次命名为 sheet_name, sheet_name_2, sheet_name_3 ...
+
+        Args:
+            df (pd.DataFrame): 待写入的数据
+            path (Path): xlsx文件路径
+            sheet_name (str, optional): 工作表名称. Defaults to "Sheet1".
+            index (bool, optional): 是否写入索引. Defaults to False.
+            progress (bool, optional): 是否显示写入进度条. Defaults to False.
+
+        Returns:
+            Path: xlsx文件路径
+        """
+
+        path = Path(path)
+        if index:
+            df = df.reset_index()
+
+        start_time: float = time.time()
+        rows_per_sheet: int = self.max_rows - 1
+        header: list[str] = [str(col) for col in df.columns]
+        n_sheets: int = max((len(df) + rows_per_sheet - 1) // rows_per_sheet, 1)
+
+        wb = Workbook(write_only=True)
+        with tqdm(
+            total=len(df), desc="写入进度", unit="行", disable=not progress
+        ) as bar:
+            for n in range(n_sheets):
+                ws = wb.create_sheet(sheet_name if n == 0 else f"{sheet_name}_{n + 1}")
+                ws.append(header)
+
+                sheet_start: int = n * rows_per_sheet
+                sheet_end: int = min(sheet_start + rows_per_sheet, len(df))
+                for i in range(sheet_start, sheet_end, self.chunk_size):
+                    chunk: pd.DataFrame = df.iloc[
+                        i : min(i + self.chunk_size, sheet_end)
+                    ]
+                    # 空值写为空单元格, 其余转换为 Python 原生类型
+                    chunk = chunk.astype(object).where(chunk.notna(), None)
+                    for row in chunk.itertuples(index=False, name=None):
+                        ws.append(row)
+                    bar.update(len(chunk))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        wb.save(path)
+
+        self.logger.info(
+            f"'{path.name}' 写入完成! 耗时: {time.time() - start_time:.2f}秒 |"
+            f"行数: {len(df): ,} , 工作表数: {n_sheets}"
+        )
+
+        return path
@@ -1,11 +1,41 @@
+import fnmatch
 import logging
+import os
+import re
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
 from pathlib import Path
+from typing import Iterable
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """扫描得到的文件信息"""
+
+    path: Path
+    # 文件大小(字节)
+    size: int
+    # 修改时间(时间戳)
+    mtime: float
+    # 文件名中的日期, 没有日期时为 None
+    day: date | None = None
 
 
 class PathReading:
     """读取需要的文件路径"""
 
+    # 各文件类型对应的后缀
+    suffixes: dict[str, tuple[str, ...]] = {
+        "csv": (".csv",),
+        "excel": (".xlsx", ".xls"),
+    }
+    # 文件名中的日期, 支持 20260117 和 2026-01-17 两种写法
+    date_pattern: re.Pattern = re.compile(r"(20\d{2})-?(\d{2})-?(\d{2})")
+    # 需要忽略的文件名前缀: Excel 打开时生成的锁文件
+    lock_prefix: str = "~$"
+
     def __init__(self, project_name: str = "PathReading", method: str = "csv"):
         """初始化 PathReading 类实例
 
@@ -51,31 +81,155 @@ class PathReading:
 
         return path
 
-    def path_reading(self, dir_path: Path) -> list[Path]:
+    @classmethod
+    def date_from_name(cls, name: str) -> date | None:
+        """从文件名中识别日期, 支持 20260117 和 2026-01-17 两种写法
+
+        Args:
+            name (str): 文件名
+
+        Returns:
+            date | None: 识别到的日期, 没有日期时为 None
         """
 
+        for match in cls.date_pattern.finditer(name):
+            try:
+                return date(*(int(g) for g in match.groups()))
+            except ValueError:
+                continue
+
+        return None
+
+    def __scan_dir(
+        self, dir_path: str, suffixes: tuple[str, ...]
+    ) -> tuple[list[os.DirEntry], list[str]]:
+        """扫描一层文件夹, 返回后缀匹配的文件和子文件夹"""
+
+        files: list[os.DirEntry] = list()
+        sub_dirs: list[str] = list()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        sub_dirs.append(entry.path)
+                    elif entry.name.lower().endswith(suffixes) and not (
+                        entry.name.startswith(self.lock_prefix)
+                    ):
+                        files.append(entry)
+        except PermissionError as e:
+            self.logger.warning(f"没有权限读取文件夹: {dir_path} ({e})")
+
+        return files, sub_dirs
+
+    @staticmethod
+    def __match(name: str, patterns: Iterable[str]) -> bool:
+        """文件名是否匹配任一通配符(不区分大小写)"""
+
+        name = name.lower()
+        return any(fnmatch.fnmatchcase(name, pattern.lower()) for pattern in patterns)
+
+    def scan(
+        self,
+        dir_path: Path,
+        include: list[str] | None = None,
+        exclude: list[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        recursive: bool = True,
+        suffixes: tuple[str, ...] | None = None,
+        order: str = "name",
+        workers: int = 1,
+    ) -> list[FileInfo]:
+        """一次遍历文件夹, 同时匹配多个后缀, 并按文件名和文件名中的日期筛选
+
+        workers 大于 1 时同一层的子文件夹使用线程并行扫描, 适用于共享盘等访问延迟较高的文件夹.
+
         Args:
             dir_path (Path): 待读取的文件夹路径
+            include (list[str] | None, optional): 文件名需匹配其中之一的通配符, 例如 ["*交件*"]. Defaults to None.
+            exclude (list[str] | None, optional): 需要排除的文件名通配符. Defaults to None.
+            start (date | None, optional): 文件名中的日期不早于该日期, 设置后忽略没有日期的文件. Defaults to None.
+            end (date | None, optional): 文件名中的日期不晚于该日期, 设置后忽略没有日期的文件. Defaults to None.
+            recursive (bool, optional): 是否读取子文件夹. Defaults to True.
+            suffixes (tuple[str, ...] | None, optional): 文件后缀, None 时使用 method 对应的后缀. Defaults to None.
+            order (str, optional): 排序方式, 参数值有: "name" 按路径, "size" 从大到小, "mtime" 从新到旧. Defaults to "name".
+            workers (int, optional): 扫描文件夹的线程数. Defaults to 1.
 
         Returns:
-            list[Path]: 文件路径
+            list[FileInfo]: 文件信息
         """
 
-        path_list: list[Path] = list()
+        sort_keys = {
+            "name": (lambda f: str(f.path), False),
+            "size": (lambda f: f.size, True),
+            "mtime": (lambda f: f.mtime, True),
+        }
+        if order not in sort_keys:
+            self.logger.error(
+                f"scan的order参数没有{order}值, order参数值有: 'name', 'size', 'mtime'."
+            )
+            raise ValueError()
 
-        if self.method == "csv":
-            for p in dir_path.rglob("*.csv"):
-                path_list.append(p)
+        suffixes = tuple(s.lower() for s in (suffixes or self.suffixes[self.method]))
+        entries: list[os.DirEntry] = list()
+        level: list[str] = [os.fspath(dir_path)]
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            # 逐层扫描, 同一层的文件夹互不依赖, 可以并行
+            while level:
+                scan_map = (
+                    executor.map(self.__scan_dir, level, [suffixes] * len(level))
+                    if workers > 1 and len(level) > 1
+                    else map(self.__scan_dir, level, [suffixes] * len(level))
+                )
+                next_level: list[str] = list()
+                for files, sub_dirs in scan_map:
+                    entries.extend(files)
+                    next_level.extend(sub_dirs)
+                level = next_level if recursive else list()
+
+        file_list: list[FileInfo] = list()
+        for entry in entries:
+            if include and not self.__match(entry.name, include):
+                continue
+            if exclude and self.__match(entry.name, exclude):
+                continue
+
+            day: date | None = self.date_from_name(entry.name)
+            if start is not None or end is not None:
+                if day is None:
+                    continue
+                if (start is not None and day < start) or (
+                    end is not None and day > end
+                ):
+                    continue
+
+            stat = entry.stat()
+            file_list.append(
+                FileInfo(Path(entry.path), stat.st_size, stat.st_mtime, day)
+            )
 
-        if self.method == "excel":
-            suffix: list[str] = ["xlsx", "xls"]
-            for s in suffix:
-                for p in dir_path.rglob(f"*.{s}"):
-                    path_list.append(p)
+        key, reverse = sort_keys[order]
+        file_list.sort(key=key, reverse=reverse)
 
-        self.logger.info(f"读取到{len(path_list)}个文件.")
+        self.logger.info(
+            f"读取到{len(file_list)}个文件, 共 {sum(f.size for f in file_list) / 1024**2:.1f}MB."
+        )
 
-        return path_list
+        return file_list
+
+    def path_reading(self, dir_path: Path, **kwargs) -> list[Path]:
+        """读取文件夹(含子文件夹)中 method 类型的文件路径, 忽略 Excel 锁文件
+
+        Args:
+            dir_path (Path): 待读取的文件夹路径
+            **kwargs: 传给 scan 的筛选参数, 例如 include, exclude, start, end
+
+        Returns:
+            list[Path]: 文件路径
+        """
+
+        return [f.path for f in self.scan(dir_path, **kwargs)]
 
     def operation(self) -> list[Path]:
         """该类的主运行方法
@@ -0,0 +1,209 @@
+import io
+import logging
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+
+class FilePrefetcher:
+    """后台线程按顺序预读文件内容, 当前文件解析时后续文件的字节已读入内存
+
+    已读入但未取走的字节数不超过 max_bytes; 单个文件超过 max_bytes 时不预读, 由调用方直接从磁盘读取.
+    适用于共享盘等读取较慢, 解析时 CPU 空闲等待数据的场景.
+
+    Examples:
+        with FilePrefetcher(path_list, project_name=project_name) as prefetcher:
+            for path, source in prefetcher:
+                df = pd.read_csv(source if source is not None else path)
+    """
+
+    def __init__(
+        self,
+        paths: list[Path],
+        max_bytes: int = 256 * 1024**2,
+        project_name: str = "FilePrefetcher",
+        block_size: int = 8 * 1024**2,
+    ):
+        """初始化 FilePrefetcher 类实例
+
+        Args:
+            paths (list[Path]): 文件路径, 按该顺序读取和返回
+            max_bytes (int, optional): 预读内容占用的内存上限(字节), 0 为不预读. Defaults to 256MB.
+            project_name (str, optional): 项目名称. Defaults to "FilePrefetcher".
+            block_size (int, optional): 每次读取的字节数. Defaults to 8MB.
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.paths: list[Path] = [Path(p) for p in paths]
+        self.max_bytes: int = max(max_bytes, 0)
+        self.block_size: int = block_size
+        self.__cond: threading.Condition = threading.Condition()
+        self.__buffers: dict[int, bytes | None] = dict()
+        self.__sizes: dict[int, int] = dict()
+        self.__in_flight: int = 0
+        self.__stop: bool = False
+        self.__thread: threading.Thread | None = None
+
+    def __read(self, path: Path) -> bytes | None:
+        """分块读取文件, 停止预读或读取失败时返回 None"""
+
+        chunks: list[bytes] = list()
+        try:
+            with open(path, "rb") as f:
+                while block := f.read(self.block_size):
+                    if self.__stop:
+                        return None
+                    chunks.append(block)
+        except OSError as e:
+            # 预读失败时由调用方从磁盘读取, 错误在调用方读取时抛出
+            self.logger.warning(f"预读 '{path.name}' 失败: {e!r}")
+            return None
+
+        return b"".join(chunks)
+
+    def __reader(self) -> None:
+        """后台线程: 在内存上限内按顺序预读文件"""
+
+        for i, path in enumerate(self.paths):
+            try:
+                size: int = path.stat().st_size
+            except OSError:
+                size = self.max_bytes + 1
+
+            with self.__cond:
+                # 没有未取走的内容时总是允许读取下一个文件
+                while (
+                    not self.__stop
+                    and self.__in_flight > 0
+                    and self.__in_flight + size > self.max_bytes
+                ):
+                    self.__cond.wait()
+                if self.__stop:
+                    return
+                if size > self.max_bytes:
+                    self.__buffers[i] = None
+                    self.__cond.notify_all()
+                    continue
+                self.__in_flight += size
+                self.__sizes[i] = size
+
+            data: bytes | None = self.__read(path)
+            with self.__cond:
+                self.__buffers[i] = data
+                self.__cond.notify_all()
+
+    def __enter__(self) -> "FilePrefetcher":
+        self.__stop = False
+        self.__thread = threading.Thread(
+            target=self.__reader, name="FilePrefetcher", daemon=True
+        )
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """停止预读并释放未取走的内容"""
+
+        with self.__cond:
+            self.__stop = True
+            self.__buffers.clear()
+            self.__cond.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __iter__(self) -> Iterator[tuple[Path, io.BytesIO | None]]:
+        """按顺序返回文件路径和预读的内容, 未预读的文件内容为 None"""
+
+        if self.__thread is None:
+            self.__enter__()
+
+        for i, path in enumerate(self.paths):
+            with self.__cond:
+                while i not in self.__buffers and not self.__stop:
+                    self.__cond.wait()
+                data: bytes | None = self.__buffers.pop(i, None)
+                self.__in_flight -= self.__sizes.pop(i, 0)
+                self.__cond.notify_all()
+
+            yield path, (io.BytesIO(data) if data is not None else None)
+
+
+class BackgroundWriter:
+    """在单个后台线程中依次执行写入, 写入与下一个文件的读取和计算重叠
+
+    排队中的数据超过 max_bytes 时, 提交新的写入会等待前面的写入完成, 避免待写数据占满内存.
+    写入中的异常在 close 或退出上下文时抛出.
+    """
+
+    def __init__(
+        self, max_bytes: int = 256 * 1024**2, project_name: str = "BackgroundWriter"
+    ):
+        """初始化 BackgroundWriter 类实例
+
+        Args:
+            max_bytes (int, optional): 排队写入的数据占用的内存上限(字节). Defaults to 256MB.
+            project_name (str, optional): 项目名称. Defaults to "BackgroundWriter".
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.max_bytes: int = max(max_bytes, 0)
+        self.futures: list[Future] = list()
+        self.__cond: threading.Condition = threading.Condition()
+        self.__pending: int = 0
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="BackgroundWriter"
+        )
+
+    def __release(self, nbytes: int) -> None:
+        with self.__cond:
+            self.__pending -= nbytes
+            self.__cond.notify_all()
+
+    def submit(
+        self, func: Callable[..., Any], *args, nbytes: int = 0, **kwargs
+    ) -> Future:
+        """提交一次写入
+
+        Args:
+            func (Callable[..., Any]): 写入函数
+            nbytes (int, optional): 待写数据占用的内存(字节). Defaults to 0.
+
+        Returns:
+            Future: 写入结果
+        """
+
+        with self.__cond:
+            while self.__pending > 0 and self.__pending + nbytes > self.max_bytes:
+                self.__cond.wait()
+            self.__pending += nbytes
+
+        future: Future = self.__executor.submit(func, *args, **kwargs)
+        future.add_done_callback(lambda _: self.__release(nbytes))
+        self.futures.append(future)
+
+        return future
+
+    def close(self) -> list[Any]:
+        """等待全部写入完成
+
+        Returns:
+            list[Any]: 按提交顺序的写入结果
+        """
+
+        self.__executor.shutdown(wait=True)
+        return [future.result() for future in self.futures]
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # 已有异常时只等待写入结束, 不覆盖原异常
+            self.__executor.shutdown(wait=True)
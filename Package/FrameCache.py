@@ -0,0 +1,245 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+import pyarrow as pa
+
+
+class FrameCache:
+    """中间结果表的磁盘缓存, 以 Arrow IPC(Feather V2) 格式保存, 读取时内存映射文件
+
+    缓存键由输入(文件指纹, 数据表内容, 参数)和代码版本计算得到, 输入或计算代码变化后自动失效.
+    文件不压缩, 读取时不经过解析, Arrow 表直接引用映射的文件内容; 转换为 DataFrame 时复制一次,
+    返回的数据表可以直接修改.
+    缓存总大小超过 max_bytes 时按最近使用时间删除最久未使用的文件.
+
+    Examples:
+        cache = FrameCache(cache_dir, project_name=project_name)
+        key = cache.key("city_day", path, FrameCache.code_version(HeadquartersDaily))
+        df = cache.get_or_compute(key, func, path)
+    """
+
+    suffix: str = ".arrow"
+    # 保存原列名(整数列名等)的元数据键
+    columns_key: bytes = b"frame_cache.columns"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 2 * 1024**3,
+        project_name: str = "FrameCache",
+    ):
+        """初始化 FrameCache 类实例
+
+        Args:
+            cache_dir (Path): 缓存文件夹
+            max_bytes (int, optional): 缓存文件的总大小上限(字节). Defaults to 2GB.
+            project_name (str, optional): 项目名称. Defaults to "FrameCache".
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.cache_dir: Path = Path(cache_dir)
+        self.max_bytes: int = max(max_bytes, 0)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def code_version(*objs: Any) -> str:
+        """由类或函数的源代码计算代码版本, 计算逻辑修改后缓存自动失效
+
+        Args:
+            *objs (Any): 影响计算结果的类或函数
+
+        Returns:
+            str: 十六进制哈希值
+        """
+
+        digest = hashlib.sha256()
+        for obj in objs:
+            try:
+                source: str = inspect.getsource(obj)
+            except (OSError, TypeError):
+                # 取不到源代码(例如打包后运行)时只使用名称
+                source = repr(obj)
+            digest.update(source.encode("utf-8"))
+
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def __token(part: Any) -> str:
+        """缓存键的一个组成部分: 文件用路径, 大小和修改时间, 数据表用内容哈希"""
+
+        if isinstance(part, Path):
+            stat = part.stat()
+            return f"file:{part.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+        if isinstance(part, pd.DataFrame):
+            values: bytes = (
+                pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes()
+            )
+            return (
+                f"frame:{list(part.columns)}|{list(part.dtypes.astype(str))}|"
+                f"{hashlib.sha256(values).hexdigest()}"
+            )
+
+        return json.dumps(part, ensure_ascii=False, sort_keys=True, default=str)
+
+    def key(self, name: str, *parts: Any) -> str:
+        """计算缓存键
+
+        Args:
+            name (str): 中间结果的名称, 作为缓存文件名的前缀
+            *parts (Any): 影响结果的输入, 文件路径(Path), 数据表或可转换为 JSON 的参数
+
+        Returns:
+            str: 缓存键
+        """
+
+        digest = hashlib.sha256(name.encode("utf-8"))
+        for part in parts:
+            digest.update(self.__token(part).encode("utf-8"))
+
+        return f"{name}-{digest.hexdigest()[:32]}"
+
+    def path(self, key: str) -> Path:
+        """缓存键对应的文件路径"""
+
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """读取缓存的数据表
+
+        Args:
+            key (str): 缓存键
+
+        Returns:
+            pd.DataFrame | None: 缓存的数据表, 未缓存或文件损坏时为 None
+        """
+
+        path: Path = self.path(key)
+        if not path.exists():
+            return None
+
+        try:
+            # 内存映射读取, Arrow 表的数据缓冲区直接引用映射的文件内容.
+            # to_pandas 会复制一次数据: 零拷贝(split_blocks/self_destruct)得到的数组只读,
+            # 调用方对结果的原地修改会报错
+            with pa.memory_map(str(path), "r") as source:
+                table: pa.Table = pa.ipc.open_file(source).read_all()
+            df: pd.DataFrame = table.to_pandas()
+        except (OSError, pa.ArrowException) as e:
+            self.logger.warning(f"缓存 '{path.name}' 读取失败, 将重新计算: {e!r}")
+            self.__remove(path)
+            return None
+
+        metadata: dict[bytes, bytes] = table.schema.metadata or dict()
+        if self.columns_key in metadata:
+            df.columns = pd.Index(json.loads(metadata[self.columns_key]))
+
+        # 更新修改时间作为最近使用时间
+        os.utime(path)
+        self.logger.debug(f"命中缓存 '{path.name}': {len(df): ,} 行")
+
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """写入缓存, 写入后按大小上限清理缓存. 无法转换为 Arrow 表时只记录警告
+
+        Args:
+            key (str): 缓存键
+            df (pd.DataFrame): 数据表
+        """
+
+        path: Path = self.path(key)
+        columns: list = list(df.columns)
+        if not all(isinstance(col, (str, int)) for col in columns):
+            self.logger.warning(f"缓存 '{path.name}' 只支持字符串或整数列名, 不写入")
+            return
+
+        try:
+            # Arrow 列名只能为字符串, 原列名保存在元数据中, 读取时还原
+            table: pa.Table = pa.Table.from_pandas(
+                df.set_axis([str(col) for col in columns], axis=1)
+            )
+            metadata: dict[bytes, bytes] = dict(table.schema.metadata or dict())
+            metadata[self.columns_key] = json.dumps(columns, ensure_ascii=False).encode(
+                "utf-8"
+            )
+            table = table.replace_schema_metadata(metadata)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            self.logger.warning(
+                f"缓存 '{path.name}' 无法转换为 Arrow 表, 不写入: {e!r}"
+            )
+            return
+
+        # 先写临时文件再替换, 中断时不会留下不完整的缓存
+        tmp_path: Path = path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        self.logger.debug(
+            f"写入缓存 '{path.name}': {len(df): ,} 行, {path.stat().st_size / 1024**2:.2f}MB"
+        )
+
+        self.evict()
+
+    def get_or_compute(
+        self, key: str, func: Callable[..., pd.DataFrame], *args, **kwargs
+    ) -> pd.DataFrame:
+        """读取缓存, 未缓存时计算并写入缓存
+
+        Args:
+            key (str): 缓存键
+            func (Callable[..., pd.DataFrame]): 计算函数
+
+        Returns:
+            pd.DataFrame: 数据表
+        """
+
+        df: pd.DataFrame | None = self.get(key)
+        if df is None:
+            df = func(*args, **kwargs)
+            self.put(key, df)
+
+        return df
+
+    def __remove(self, path: Path) -> bool:
+        """删除缓存文件, 文件仍被映射等原因无法删除时跳过"""
+
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.debug(f"缓存 '{path.name}' 删除失败: {e!r}")
+            return False
+
+        return True
+
+    def evict(self) -> None:
+        """缓存总大小超过上限时, 按最近使用时间删除最久未使用的文件"""
+
+        files: list[tuple[float, int, Path]] = list()
+        for path in self.cache_dir.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total: int = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda x: x[0]):
+            if total <= self.max_bytes:
+                break
+            if self.__remove(path):
+                total -= size
+                self.logger.debug(f"缓存超过上限, 删除 '{path.name}'")
+
+    def clear(self) -> None:
+        """删除全部缓存文件"""
+
+        for path in self.cache_dir.glob(f"*{self.suffix}"):
+            self.__remove(path)
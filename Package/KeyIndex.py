@@ -0,0 +1,200 @@
+import logging
+import numpy as np
+import pandas as pd
+
+
+class KeyIndex:
+    """多列连接键的整数编码索引
+
+    每个键维度(例如 线路, 环节, 日期)的取值只编码一次, 多列键组合成一个 int64 编码后按位置连接,
+    连接前检查右表的键是否唯一, 避免一对多连接导致的行数膨胀.
+
+    Examples:
+        index = KeyIndex(project_name).add("线路", df1["线路名称"], df2["线路名称"])
+        df = index.merge(df1, df2, on=["线路名称"], dims=["线路"])
+    """
+
+    # 缺失值的编码
+    missing: int = -1
+
+    def __init__(self, project_name: str = "KeyIndex"):
+        """初始化 KeyIndex 类实例
+
+        Args:
+            project_name (str, optional): 项目名称. Defaults to "KeyIndex".
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.vocab: dict[str, pd.Index] = dict()
+
+    @staticmethod
+    def __uniques(s: pd.Series) -> pd.Index:
+        """列中不重复的非空值, 类别列直接使用类别"""
+
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            return pd.Index(s.cat.categories)
+
+        return pd.Index(pd.unique(s.dropna()))
+
+    def add(self, dim: str, *values: pd.Series) -> "KeyIndex":
+        """添加或扩充一个键维度的取值
+
+        Args:
+            dim (str): 维度名称
+            *values (pd.Series): 该维度的取值, 可传入多个表的对应列
+
+        Returns:
+            KeyIndex: 索引本身, 便于链式调用
+        """
+
+        parts: list[pd.Index] = [self.vocab[dim]] if dim in self.vocab else list()
+        parts += [self.__uniques(s) for s in values]
+        vocab: pd.Index = parts[0]
+        for part in parts[1:]:
+            vocab = vocab.append(part.difference(vocab, sort=False))
+        self.vocab[dim] = vocab.astype(object)
+
+        return self
+
+    def __codes(self, s: pd.Series, dim: str) -> np.ndarray:
+        """一列的维度编码, 空值或不在维度中的值为 -1"""
+
+        vocab: pd.Index = self.vocab[dim]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # 只对类别编码, 再按类别编码取值
+            cat_codes: np.ndarray = vocab.get_indexer(s.cat.categories.astype(object))
+            codes: np.ndarray = s.cat.codes.to_numpy()
+            return np.where(codes >= 0, cat_codes[np.maximum(codes, 0)], self.missing)
+
+        return vocab.get_indexer(s.astype(object))
+
+    def encode(
+        self, df: pd.DataFrame, on: list[str], dims: list[str] | None = None
+    ) -> np.ndarray:
+        """多列键组合为一个 int64 编码
+
+        Args:
+            df (pd.DataFrame): 数据表
+            on (list[str]): 键列
+            dims (list[str] | None, optional): 键列对应的维度, None 时与键列同名. Defaults to None.
+
+        Returns:
+            np.ndarray: 键编码, 任一键列为空或不在维度中时为 -1
+        """
+
+        dims = dims or on
+        if len(dims) != len(on):
+            self.logger.error(f"键列 {on} 与维度 {dims} 的个数不同")
+            raise ValueError()
+        unknown: list[str] = [dim for dim in dims if dim not in self.vocab]
+        if unknown:
+            self.logger.error(f"索引中没有这些维度: {unknown}, 请先调用 add")
+            raise ValueError()
+
+        sizes: list[int] = [len(self.vocab[dim]) for dim in dims]
+        if np.prod(np.array(sizes, dtype=float)) >= 2**62:
+            self.logger.error(f"键的组合数过多, 无法编码为 int64: {sizes}")
+            raise ValueError()
+
+        key: np.ndarray = np.zeros(len(df), dtype=np.int64)
+        valid: np.ndarray = np.ones(len(df), dtype=bool)
+        for col, dim, size in zip(on, dims, sizes):
+            codes: np.ndarray = self.__codes(df[col], dim)
+            valid &= codes >= 0
+            key = key * size + codes
+
+        return np.where(valid, key, self.missing)
+
+    def merge(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        on: list[str],
+        dims: list[str] | None = None,
+        how: str = "left",
+        validate: str = "many_to_one",
+    ) -> pd.DataFrame:
+        """按整数编码连接两表, 右表每个键最多一行, 结果行数不会超过左表
+
+        与 pd.merge 不同, 空值键不参与匹配. 结果保持左表的行顺序, 列为左表的列加右表的非键列.
+
+        Args:
+            left (pd.DataFrame): 左表
+            right (pd.DataFrame): 右表
+            on (list[str]): 键列
+            dims (list[str] | None, optional): 键列对应的维度, None 时与键列同名. Defaults to None.
+            how (str, optional): 连接方式, 参数值有: "left", "inner". Defaults to "left".
+            validate (str, optional): 键的唯一性检查, 参数值有: "many_to_one", "one_to_one". Defaults to "many_to_one".
+
+        Returns:
+            pd.DataFrame: 连接后的表
+        """
+
+        if how not in ["left", "inner"]:
+            self.logger.error(
+                f"merge的how参数没有{how}值, how参数值有: 'left', 'inner'."
+            )
+            raise ValueError()
+        if validate not in ["many_to_one", "one_to_one"]:
+            self.logger.error(
+                f"merge的validate参数没有{validate}值, "
+                f"validate参数值有: 'many_to_one', 'one_to_one'."
+            )
+            raise ValueError()
+
+        value_cols: list[str] = [col for col in right.columns if col not in on]
+        overlap: list[str] = [col for col in value_cols if col in left.columns]
+        if overlap:
+            self.logger.error(f"左右两表有相同的非键列: {overlap}, 请先重命名")
+            raise ValueError()
+
+        left_key: np.ndarray = self.encode(left, on, dims)
+        right_key: np.ndarray = self.encode(right, on, dims)
+
+        self.__check_unique(right_key, right, on, "右表", left_key)
+        if validate == "one_to_one":
+            self.__check_unique(left_key, left, on, "左表")
+
+        # 右表键唯一, 每个左表行最多匹配一行
+        right_pos: np.ndarray = pd.Index(right_key).get_indexer(left_key)
+        right_pos[left_key == self.missing] = -1
+
+        df_right: pd.DataFrame = right.loc[:, value_cols].reset_index(drop=True)
+        df_right = df_right.reindex(right_pos).reset_index(drop=True)
+        df: pd.DataFrame = pd.concat([left.reset_index(drop=True), df_right], axis=1)
+
+        if how == "inner":
+            df = df.loc[right_pos >= 0].reset_index(drop=True)
+
+        matched: int = int((right_pos >= 0).sum())
+        self.logger.debug(
+            f"按 {on} 连接: 左表 {len(left): ,} 行, 匹配 {matched: ,} 行, 结果 {len(df): ,} 行"
+        )
+
+        return df
+
+    def __check_unique(
+        self,
+        key: np.ndarray,
+        df: pd.DataFrame,
+        on: list[str],
+        name: str,
+        other_key: np.ndarray | None = None,
+    ) -> None:
+        """检查键是否唯一, 重复时记录重复的键和将膨胀的行数并报错"""
+
+        valid: np.ndarray = key != self.missing
+        dup_mask: np.ndarray = pd.Series(key).duplicated(keep=False).to_numpy() & valid
+        if not dup_mask.any():
+            return
+
+        dup_keys: pd.DataFrame = df.loc[dup_mask, on].drop_duplicates()
+        message: str = (
+            f"{name}的连接键 {on} 不唯一, 共 {len(dup_keys): ,} 个重复的键, "
+            f"例如: {dup_keys.head(5).to_dict('records')}"
+        )
+        if other_key is not None:
+            hits: int = int(np.isin(other_key, key[dup_mask]).sum())
+            message += f", 一对多连接将使左表的 {hits: ,} 行重复"
+        self.logger.error(message)
+        raise ValueError()
@@ -1,29 +1,113 @@
+import atexit
+import json
 import logging
+import multiprocessing
+from datetime import datetime
 from typing import Any  # 必须导入
 
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 
+class JsonFormatter(logging.Formatter):
+    """将日志记录格式化为一行 JSON, 记录带有 profile 属性时一并输出"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        profile: dict[str, Any] | None = getattr(record, "profile", None)
+        if profile is not None:
+            data.update(profile)
+
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class ProfileFilter(logging.Filter):
+    """只保留 StageProfiler 输出的阶段指标记录"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return hasattr(record, "profile")
+
+
 class LogConfig:
     """日志初始化配置日志器"""
 
-    def __init__(self, project_name: str | None = None):
+    # 队列模式下各项目的日志队列和后台监听线程
+    listeners: dict[str, tuple[Any, QueueListener]] = dict()
+
+    def __init__(
+        self,
+        project_name: str | None = None,
+        level: str = "INFO",
+        log_file: str | Path | None = None,
+        max_bytes: int = 512 * 1024,
+        backup_count: int = 10,
+        queue: bool = False,
+    ):
         """初始化 LogConfig 类实例
 
         Args:
             projiect_name (str, optional): 项目名称. Defaults to None.
+            level (str, optional): 日志级别. Defaults to "INFO".
+            log_file (str | Path | None, optional): 日志文件路径. Defaults to None(./logs/项目名称.log).
+            max_bytes (int, optional): 单个日志文件的最大字节数. Defaults to 512 * 1024.
+            backup_count (int, optional): 保留的历史日志文件数. Defaults to 10.
+            queue (bool, optional): 是否使用队列模式, 处理器在后台线程中运行, 子进程的日志转发到主进程. Defaults to False.
         """
 
         self.project_name: str | None = project_name
+        self.queue: bool = queue
 
+        log_file = log_file or f"./logs/{project_name}.log"
         self.log_config: dict[str, Any] = {
-            "log_file": f"./logs/{project_name}.log",
-            "level": "INFO",
-            "max_bytes": 512 * 1024,  # 0.5MB
-            "backup_count": 10,
+            "log_file": log_file,
+            # 阶段指标的结构化日志, 每行一条 JSON
+            "profile_file": Path(log_file).with_suffix(".profile.jsonl"),
+            "level": level,
+            "max_bytes": max_bytes,
+            "backup_count": backup_count,
         }
 
+    def __handlers(self, log_file: Path) -> list[logging.Handler]:
+        """文本日志, 控制台和阶段指标三个处理器"""
+
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=self.log_config["max_bytes"],
+            backupCount=self.log_config["backup_count"],
+            encoding="utf-8",
+        )
+
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(filename)s:%(lineno)d - %(levelname)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+
+        file_handler.setFormatter(formatter)
+
+        # 控制台处理器
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+
+        # 阶段指标处理器: 与文本日志同时输出 JSON 记录
+        profile_handler = RotatingFileHandler(
+            Path(self.log_config["profile_file"]),
+            maxBytes=self.log_config["max_bytes"],
+            backupCount=self.log_config["backup_count"],
+            encoding="utf-8",
+        )
+        profile_handler.setFormatter(JsonFormatter())
+        profile_handler.addFilter(ProfileFilter())
+
+        return [file_handler, console_handler, profile_handler]
+
     def setup_logger(self) -> logging.Logger:
         """为项目初始化配置日志处理器
 
@@ -48,27 +132,80 @@ class LogConfig:
         if logger.handlers:
             return logger
 
-        file_handler = RotatingFileHandler(
-            log_file,
-            maxBytes=self.log_config["max_bytes"],
-            backupCount=self.log_config["backup_count"],
-            encoding="utf-8",
-        )
+        handlers: list[logging.Handler] = self.__handlers(log_file)
 
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(filename)s:%(lineno)d - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
+        if self.queue:
+            # 队列模式: 日志器只负责入队, 写文件和控制台在后台线程中完成.
+            # 使用进程间队列, 子进程通过 pool_kwargs 的初始化函数把日志转发到这里
+            log_queue = multiprocessing.Queue(-1)
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            logger.addHandler(QueueHandler(log_queue))
 
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-        # 控制台处理器
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+            self.listeners[f"{self.project_name}"] = (log_queue, listener)
+            atexit.register(self.stop, f"{self.project_name}")
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
 
         # 重要：不要关闭传播（默认就是 True）
         # logger.propagate = True  # 这是默认值
 
         return logger
+
+    @classmethod
+    def stop(cls, project_name: str) -> None:
+        """停止队列模式的后台监听线程, 写完队列中剩余的日志
+
+        Args:
+            project_name (str): 项目名称
+        """
+
+        entry: tuple[Any, QueueListener] | None = cls.listeners.pop(project_name, None)
+        if entry is None:
+            return
+
+        log_queue, listener = entry
+        listener.stop()
+        logger = logging.getLogger(project_name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        for handler in listener.handlers:
+            handler.close()
+        log_queue.close()
+
+    @classmethod
+    def pool_kwargs(cls, project_name: str) -> dict[str, Any]:
+        """进程池的初始化参数, 队列模式下子进程的日志转发到主进程, 否则为空
+
+        Examples:
+            ProcessPoolExecutor(max_workers=4, **LogConfig.pool_kwargs(project_name))
+
+        Args:
+            project_name (str): 项目名称, 可以是子日志器名称
+
+        Returns:
+            dict[str, Any]: initializer 和 initargs
+        """
+
+        root_name: str = project_name.split(".", 1)[0]
+        entry: tuple[Any, QueueListener] | None = cls.listeners.get(root_name)
+        if entry is None:
+            return dict()
+
+        level: int = logging.getLogger(root_name).level
+        return {
+            "initializer": _worker_logging,
+            "initargs": (entry[0], root_name, level),
+        }
+
+
+def _worker_logging(log_queue: Any, project_name: str, level: int) -> None:
+    """进程池子进程的初始化函数, 日志只放入队列, 由主进程统一写出"""
+
+    logger = logging.getLogger(project_name)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
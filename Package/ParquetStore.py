@@ -0,0 +1,208 @@
+import hashlib
+import logging
+import os
+import re
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from .FilePathReading import PathReading
+from .TimeParsing import TimeParsing
+
+
+class ParquetStore:
+    """本地 Parquet 数据仓库, 按 报表类型/日期 分区存储每日的源数据
+
+    每个源文件在分区中写入单独的分区文件, 同一日期的数据来自多个源文件时全部保留,
+    同一源文件重新写入时只替换该文件的分区文件.
+    """
+
+    # 未指定来源(及旧版本写入)的分区文件名
+    part_name: str = "part-0.parquet"
+    date_pattern: re.Pattern = PathReading.date_pattern
+
+    def __init__(self, root: Path, project_name: str = "ParquetStore"):
+        """初始化 ParquetStore 类实例
+
+        Args:
+            root (Path): 数据仓库根目录
+            project_name (str, optional): 项目名称. Defaults to "ParquetStore".
+        """
+
+        self.project_name: str = project_name
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.root: Path = Path(root)
+
+    def report_dir(self, report: str) -> Path:
+        """报表类型对应的文件夹"""
+
+        return self.root / f"report={report}"
+
+    def part_file(self, source: str | None = None) -> str:
+        """来源对应的分区文件名, 由来源的哈希值区分不同的源文件"""
+
+        if source is None:
+            return self.part_name
+
+        digest: str = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        return f"part-{digest}.parquet"
+
+    def partition_path(self, report: str, day: date, source: str | None = None) -> Path:
+        """报表类型, 日期和来源对应的分区文件路径"""
+
+        return self.report_dir(report) / f"date={day:%Y-%m-%d}" / self.part_file(source)
+
+    @classmethod
+    def date_from_name(cls, name: str) -> date | None:
+        """从文件名中识别日期, 支持 20260117 和 2026-01-17 两种写法
+
+        Args:
+            name (str): 文件名
+
+        Returns:
+            date | None: 识别到的日期, 没有日期时为 None
+        """
+
+        return PathReading.date_from_name(name)
+
+    def ingest(
+        self,
+        df: pd.DataFrame,
+        report: str,
+        day: date | None = None,
+        date_col: str | None = None,
+        source: str | None = None,
+    ) -> list[Path]:
+        """将数据写入分区, 同一来源重复写入时替换该来源原有的数据
+
+        Args:
+            df (pd.DataFrame): 待写入的数据
+            report (str): 报表类型
+            day (date | None, optional): 整张表所属的日期. Defaults to None.
+            date_col (str | None, optional): 按该列的日期拆分写入多个分区. Defaults to None.
+            source (str | None, optional): 数据来源, 一般为源文件的绝对路径. None 时所有数据共用一个分区文件, 同一分区重复写入时覆盖原数据. Defaults to None.
+
+        Returns:
+            list[Path]: 写入的分区文件路径
+        """
+
+        if (day is None) == (date_col is None):
+            self.logger.error("ingest方法的 day 和 date_col 参数必须且只能指定一个")
+            raise ValueError()
+
+        if day is not None:
+            path_list: list[Path] = [
+                self.__write(df, self.partition_path(report, day, source))
+            ]
+        else:
+            # 与报表使用相同的时间解析, 同一字符串在写入和计算时解析为同一日期
+            days: pd.Series = TimeParsing(self.project_name).parse(df[date_col]).dt.date
+            n_missing: int = int(days.isna().sum())
+            if n_missing:
+                self.logger.warning(
+                    f"'{date_col}' 有 {n_missing: ,} 行为空, 这些行不写入数据仓库"
+                )
+            path_list = [
+                self.__write(df_day, self.partition_path(report, d, source))
+                for d, df_day in df.groupby(days, sort=True)
+            ]
+
+        if source is not None:
+            self.__remove_stale(report, source, path_list)
+
+        return path_list
+
+    def __remove_stale(self, report: str, source: str, path_list: list[Path]) -> None:
+        """删除该来源以前写入, 本次没有写入的分区文件(例如更正后的文件不再包含某个日期)"""
+
+        written: set[Path] = set(path_list)
+        for path in self.report_dir(report).glob(f"date=*/{self.part_file(source)}"):
+            if path not in written:
+                path.unlink()
+                self.logger.info(f"移除来源已不包含的分区文件 '{path.parent.name}'")
+
+    def __write(self, df: pd.DataFrame, path: Path) -> Path:
+        """写入单个分区, 先写临时文件再替换, 避免中断时留下损坏的分区"""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.name != self.part_name and (path.parent / self.part_name).exists():
+            self.logger.warning(
+                f"分区 '{path.parent.name}' 中有旧版本写入的 '{self.part_name}', "
+                f"无法区分其来源, 可能与本次写入的数据重复, 建议删除该报表后重新写入"
+            )
+        tmp_path: Path = path.with_suffix(".tmp")
+        table: pa.Table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+        self.logger.info(f"写入分区 '{path.parent.name}', 行数: {len(df): ,}")
+
+        return path
+
+    def dates(self, report: str) -> list[date]:
+        """报表类型已经写入的日期"""
+
+        return sorted(
+            datetime.strptime(p.name.split("=", 1)[1], "%Y-%m-%d").date()
+            for p in self.report_dir(report).glob("date=*")
+            if any(p.glob("part-*.parquet"))
+        )
+
+    def query(
+        self,
+        report: str,
+        columns: list[str] | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        filters: list[tuple[str, str, Any]] | None = None,
+    ) -> pd.DataFrame:
+        """查询数据, 只读取需要的列和日期分区, 过滤条件下推到 Parquet 读取
+
+        Args:
+            report (str): 报表类型
+            columns (list[str] | None, optional): 需要的列, None 时读取全部列. Defaults to None.
+            start (date | None, optional): 开始日期(包含). Defaults to None.
+            end (date | None, optional): 结束日期(包含). Defaults to None.
+            filters (list[tuple[str, str, Any]] | None, optional): 过滤条件, 例如 [("0:及时,1延误", "==", 1)]. Defaults to None.
+
+        Returns:
+            pd.DataFrame: 查询结果, "date" 列为分区日期
+        """
+
+        report_dir: Path = self.report_dir(report)
+        if not report_dir.exists():
+            self.logger.error(f"数据仓库中没有 '{report}' 的数据")
+            raise FileNotFoundError(report_dir)
+
+        dataset = ds.dataset(
+            report_dir,
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([("date", pa.string())]), flavor="hive"
+            ),
+        )
+
+        expression = None
+        conditions = list()
+        if start is not None:
+            conditions.append(ds.field("date") >= f"{start:%Y-%m-%d}")
+        if end is not None:
+            conditions.append(ds.field("date") <= f"{end:%Y-%m-%d}")
+        if filters:
+            conditions.append(pq.filters_to_expression(filters))
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        table: pa.Table = dataset.to_table(columns=columns, filter=expression)
+        df: pd.DataFrame = table.to_pandas()
+
+        self.logger.info(
+            f"查询 '{report}' 完成, 行数: {df.shape[0]: ,} , 列数: {df.shape[1]: ,}"
+        )
+
+        return df
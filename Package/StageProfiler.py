@@ -0,0 +1,143 @@
+import copy
+import logging
+import threading
+import time
+import psutil
+
+from contextlib import ContextDecorator
+from typing import Any
+
+
+class PeakMemory:
+    """后台线程定时采样进程常驻内存, 记录阶段运行期间的内存峰值
+
+    不使用 tracemalloc, 因为它会显著拖慢 openpyxl 这类创建大量小对象的代码.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """初始化 PeakMemory 类实例
+
+        Args:
+            interval (float, optional): 采样间隔(秒). Defaults to 0.005.
+        """
+
+        self.interval: float = interval
+        self.process: psutil.Process = psutil.Process()
+        self.baseline: int = 0
+        self.peak: int = 0
+        self.__stop: threading.Event = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    def __sample(self) -> None:
+        while not self.__stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self) -> "PeakMemory":
+        self.baseline = self.peak = self.process.memory_info().rss
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__sample, daemon=True)
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+    @property
+    def peak_mb(self) -> float:
+        """阶段运行期间比开始时多占用的内存峰值(MB)"""
+
+        return round((self.peak - self.baseline) / 1024**2, 2)
+
+
+class StageProfiler(ContextDecorator):
+    """记录流程阶段的耗时, CPU时间, 输入/输出行数和内存峰值
+
+    可作为上下文管理器或装饰器使用. 结束时输出一条日志, 记录的 profile 属性为阶段指标,
+    LogConfig 的 JSON 处理器会把它写入结构化日志文件.
+
+    Examples:
+        with StageProfiler("读取数据", project_name) as prof:
+            df = pd.read_csv(path)
+            prof.rows_out = len(df)
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        project_name: str = "StageProfiler",
+        rows_in: int | None = None,
+        memory: bool = True,
+        level: int = logging.INFO,
+    ):
+        """初始化 StageProfiler 类实例
+
+        Args:
+            stage (str): 阶段名称
+            project_name (str, optional): 项目名称. Defaults to "StageProfiler".
+            rows_in (int | None, optional): 输入行数, 也可在阶段内设置. Defaults to None.
+            memory (bool, optional): 是否记录内存峰值. Defaults to True.
+            level (int, optional): 日志级别. Defaults to logging.INFO.
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.stage: str = stage
+        self.memory: bool = memory
+        self.level: int = level
+        self.rows_in: int | None = rows_in
+        self.rows_out: int | None = None
+        self.record: dict[str, Any] = dict()
+        self.__peak: PeakMemory | None = None
+        self.__start_wall: float = 0.0
+        self.__start_cpu: float = 0.0
+
+    def _recreate_cm(self) -> "StageProfiler":
+        """作为装饰器时每次调用使用新的实例, 避免并发或递归调用互相覆盖"""
+
+        return copy.copy(self)
+
+    def __enter__(self) -> "StageProfiler":
+        if self.memory:
+            self.__peak = PeakMemory()
+            self.__peak.__enter__()
+        self.__start_wall = time.perf_counter()
+        self.__start_cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        wall: float = time.perf_counter() - self.__start_wall
+        cpu: float = time.process_time() - self.__start_cpu
+        if self.__peak is not None:
+            self.__peak.__exit__(exc_type, exc, tb)
+
+        self.record = {
+            "stage": self.stage,
+            "status": "ok" if exc_type is None else "failed",
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "peak_mb": self.__peak.peak_mb if self.__peak is not None else None,
+        }
+
+        rows: str = "".join(
+            f" | {name}: {value: ,}"
+            for name, value in [("输入行数", self.rows_in), ("输出行数", self.rows_out)]
+            if value is not None
+        )
+        memory: str = (
+            f" | 内存峰值: {self.record['peak_mb']}MB"
+            if self.__peak is not None
+            else ""
+        )
+        self.logger.log(
+            self.level,
+            f"[{self.stage}] {'完成' if exc_type is None else '失败'}! "
+            f"耗时: {wall:.2f}秒 | CPU: {cpu:.2f}秒{rows}{memory}",
+            extra={"profile": self.record},
+        )
+
+        # 不吞掉阶段内的异常
+        return False
@@ -0,0 +1,130 @@
+import logging
+import time
+import numpy as np
+import pandas as pd
+
+from .TimeParsing import TimeParsing
+
+
+class TaotianStandard:
+    """计算中心发中心频次对应的时效标准"""
+
+    # 频次报表中需要的列
+    col_need: list[str] = [
+        "频次名称",
+        "始发中心",
+        "状态",
+        "目的中心",
+        "始发发车时间",
+        "目的到车时间",
+        "总运行时效",
+    ]
+    # 一天的分钟数
+    day_minutes: int = 24 * 60
+
+    def __init__(self, project_name: str = "TaotianStandard"):
+        """初始化 TaotianStandard 类实例
+
+        Args:
+            project_name (str, optional): 项目名称. Defaults to "TaotianStandard".
+        """
+
+        self.project_name: str = project_name
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+
+    def __prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """选取需要的列, 解析时间列, 并去掉频次名称最后一段的班次编号"""
+
+        missing: list[str] = [col for col in self.col_need if col not in df.columns]
+        if missing:
+            self.logger.error(f"频次报表缺少需要的列: {missing}")
+            raise ValueError()
+
+        df_fq: pd.DataFrame = df.loc[:, self.col_need].copy()
+        timeparsing = TimeParsing(project_name=self.project_name)
+        for t in ["始发发车时间", "目的到车时间"]:
+            if not pd.api.types.is_datetime64_any_dtype(df_fq[t]):
+                df_fq[t] = timeparsing.parse(df_fq[t])
+
+        df_fq["频次名称"] = df_fq["频次名称"].str.rsplit("-", n=1).str[0]
+
+        return df_fq
+
+    @staticmethod
+    def select_departure(df: pd.DataFrame, cutoff: pd.Timestamp) -> pd.DataFrame:
+        """每个频次选取一个代表发车时间
+
+        优先选取截止时间前最晚的发车, 截止时间前没有发车时选取最晚的发车; 发车时间相同时取总运行时效最大的一条.
+
+        Args:
+            df (pd.DataFrame): 频次数据
+            cutoff (pd.Timestamp): 截止时间
+
+        Returns:
+            pd.DataFrame: 每个频次一行的数据表
+        """
+
+        df = df.loc[df["始发发车时间"].notna()]
+        before: pd.Series = (df["始发发车时间"] < cutoff).rename("_截止前")
+
+        # 一次排序后每个频次的第一行即为所需的行
+        order: pd.DataFrame = pd.concat(
+            [
+                df.loc[:, ["频次名称"]],
+                before,
+                df.loc[:, ["始发发车时间", "总运行时效"]],
+            ],
+            axis=1,
+        )
+        order = order.sort_values(
+            by=["频次名称", "_截止前", "始发发车时间", "总运行时效"], ascending=False
+        )
+        idx = order.drop_duplicates(subset="频次名称", keep="first").index
+
+        return df.loc[idx]
+
+    def frequency_standard(
+        self, df: pd.DataFrame, cutoff: str | pd.Timestamp
+    ) -> pd.DataFrame:
+        """计算每个频次的时效标准
+
+        截止时间前发车(早上发车)的时效标准: 分钟差值小于0为1天, 否则为 2 + 分钟差值整除1440;
+        截止时间后发车(晚上发车)的时效标准: 分钟差值小于0为1天, 否则为 1 + 分钟差值整除1440.
+
+        Args:
+            df (pd.DataFrame): 频次报表
+            cutoff (str | pd.Timestamp): 区分早上和晚上发车的截止时间, 例如 "2026-01-18 17:00:00"
+
+        Returns:
+            pd.DataFrame: 早上发车(按发车时间降序)和晚上发车(按发车时间升序)的时效标准
+        """
+
+        start_time: float = time.time()
+        cutoff = pd.Timestamp(cutoff)
+
+        df_fq: pd.DataFrame = self.select_departure(self.__prepare(df), cutoff)
+
+        departure: pd.Series = df_fq["始发发车时间"]
+        df_fq["当天分钟数"] = (24 - departure.dt.hour) * 60 - departure.dt.minute
+        df_fq["分钟差值"] = df_fq["总运行时效"] - df_fq["当天分钟数"]
+
+        mask_mor: pd.Series = departure < cutoff
+        diff: pd.Series = df_fq["分钟差值"]
+        days: pd.Series = diff // self.day_minutes
+        df_fq["时效标准"] = np.where(diff < 0, 1, np.where(mask_mor, 2, 1) + days)
+
+        # 区分早上发车和晚上发车
+        morning: pd.DataFrame = df_fq.loc[mask_mor].sort_values(
+            by="始发发车时间", ascending=False
+        )
+        night: pd.DataFrame = df_fq.loc[~mask_mor].sort_values(
+            by="始发发车时间", ascending=True
+        )
+        df_result: pd.DataFrame = pd.concat([morning, night], axis=0)
+
+        self.logger.info(
+            f"时效标准计算完成! 耗时: {time.time() - start_time:.2f}秒 | "
+            f"频次数: {df_result.shape[0]: ,}"
+        )
+
+        return df_result
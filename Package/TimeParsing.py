@@ -0,0 +1,105 @@
+import logging
+import pandas as pd
+
+
+class TimeParsing:
+    """时间解析类: 从样本中识别主要时间格式, 按固定格式批量解析, 只有解析失败的行才逐个解析"""
+
+    formats: list[str] = [
+        "%Y-%m-%d %H:%M:%S",
+        "%Y/%m/%d %H:%M:%S",
+        "%Y-%m-%d %H:%M:%S.%f",
+        "%Y-%m-%d %H:%M",
+        "%Y/%m/%d %H:%M",
+        "%Y-%m-%d",
+        "%Y/%m/%d",
+        "%Y%m%d %H:%M:%S",
+        "%Y%m%d%H%M%S",
+        "%Y%m%d",
+    ]
+
+    def __init__(
+        self,
+        project_name: str = "TimeParsing",
+        sample_size: int = 1_000,
+        formats: list[str] | None = None,
+    ):
+        """初始化 TimeParsing 类实例
+
+        Args:
+            project_name (str, optional): 项目名称. Defaults to "TimeParsing".
+            sample_size (int, optional): 识别时间格式的样本行数. Defaults to 1_000.
+            formats (list[str] | None, optional): 候选时间格式, None 时使用类中的默认格式. Defaults to None.
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.sample_size: int = sample_size
+        self.formats: list[str] = formats or self.formats
+        # 最近一次解析中逐个解析的行数, 用于发现数据源格式变化
+        self.fallback_count: int = 0
+
+    def detect_format(self, series: pd.Series) -> str | None:
+        """从样本中识别能解析最多行的时间格式
+
+        Args:
+            series (pd.Series): 待解析的时间列
+
+        Returns:
+            str | None: 时间格式, 没有任何格式能解析样本时为 None
+        """
+
+        sample: pd.Series = series.dropna()
+        if sample.empty:
+            return None
+        sample = sample.sample(min(self.sample_size, len(sample)), random_state=0)
+
+        best_format: str | None = None
+        best_count: int = 0
+        for fmt in self.formats:
+            count: int = (
+                pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()
+            )
+            if count > best_count:
+                best_format, best_count = fmt, count
+            if count == len(sample):
+                break
+
+        return best_format
+
+    def parse(self, series: pd.Series) -> pd.Series:
+        """解析时间列
+
+        Args:
+            series (pd.Series): 待解析的时间列
+
+        Returns:
+            pd.Series: datetime64 类型的时间列
+        """
+
+        self.fallback_count = 0
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+
+        fmt: str | None = self.detect_format(series)
+        if fmt is None:
+            result: pd.Series = pd.to_datetime(series, format="mixed")
+            self.fallback_count = int(series.notna().sum())
+        else:
+            result = pd.to_datetime(series, format=fmt, errors="coerce")
+            # 固定格式解析失败的非空行, 再逐个解析
+            mask_failed = result.isna() & series.notna()
+            self.fallback_count = int(mask_failed.sum())
+            if self.fallback_count:
+                result.loc[mask_failed] = pd.to_datetime(
+                    series.loc[mask_failed], format="mixed"
+                )
+
+        if self.fallback_count:
+            self.logger.warning(
+                f"'{series.name}' 主要格式为 {fmt}, "
+                f"有 {self.fallback_count: ,} 行不符合该格式, 已逐个解析"
+            )
+        else:
+            self.logger.info(f"'{series.name}' 按格式 {fmt} 解析完成")
+
+        return result
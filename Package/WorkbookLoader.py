@@ -0,0 +1,162 @@
+import logging
+import time
+import pandas as pd
+
+from pathlib import Path
+from typing import Any
+
+
+class WorkbookLoader:
+    """工作簿读取类, 每个工作簿只打开一次即可读取多个工作表, 并在进程内缓存已解析的工作表"""
+
+    # 进程内缓存: (文件路径, 大小, 修改时间, 工作表, 读取参数) -> 数据表
+    __cache: dict[tuple, pd.DataFrame] = dict()
+
+    def __init__(self, project_name: str = "WorkbookLoader", cache: bool = True):
+        """初始化 WorkbookLoader 类实例
+
+        Args:
+            project_name (str, optional): 项目名称. Defaults to "WorkbookLoader".
+            cache (bool, optional): 是否使用进程内缓存. Defaults to True.
+        """
+
+        self.logger: logging.Logger = logging.getLogger(f"{project_name}.{__name__}")
+        self.cache: bool = cache
+
+    @staticmethod
+    def __key(path: Path, sheet_name: str | int, params: dict[str, Any]) -> tuple:
+        """缓存键, 文件被修改后键随之变化"""
+
+        stat = path.stat()
+        return (
+            str(path.resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+            sheet_name,
+            repr(sorted(params.items())),
+        )
+
+    def read_sheets(
+        self, path: Path, sheets: dict[str | int, dict[str, Any]]
+    ) -> dict[str | int, pd.DataFrame]:
+        """打开一次工作簿读取多个工作表
+
+        Args:
+            path (Path): 工作簿路径
+            sheets (dict[str | int, dict[str, Any]]): 工作表名称或序号 -> 读取参数(skiprows, usecols 等, 同 pd.read_excel)
+
+        Returns:
+            dict[str | int, pd.DataFrame]: 工作表名称或序号 -> 数据表
+        """
+
+        path = Path(path)
+        keys: dict[str | int, tuple] = {
+            name: self.__key(path, name, params) for name, params in sheets.items()
+        }
+
+        res_dict: dict[str | int, pd.DataFrame] = dict()
+        missing: list[str | int] = list()
+        for name in sheets:
+            if self.cache and keys[name] in self.__cache:
+                # 返回副本, 避免调用方修改缓存中的数据
+                res_dict[name] = self.__cache[keys[name]].copy()
+            else:
+                missing.append(name)
+
+        if missing:
+            start_time: float = time.time()
+            with pd.ExcelFile(path) as xls:
+                not_found: list[str | int] = [
+                    n
+                    for n in missing
+                    if not (
+                        n in xls.sheet_names
+                        or isinstance(n, int)
+                        and 0 <= n < len(xls.sheet_names)
+                    )
+                ]
+                if not_found:
+                    self.logger.error(
+                        f"'{path.name}' 中没有工作表: {not_found}, 现有工作表: {xls.sheet_names}"
+                    )
+                    raise ValueError()
+
+                for name in missing:
+                    df: pd.DataFrame = xls.parse(name, **sheets[name])
+                    if self.cache:
+                        self.__cache[keys[name]] = df
+                        df = df.copy()
+                    res_dict[name] = df
+
+            self.logger.info(
+                f"读取 '{path.name}' 工作表 {missing} 完成! "
+                f"耗时: {time.time() - start_time:.2f}秒"
+            )
+
+        return {name: res_dict[name] for name in sheets}
+
+    def read_sheet(
+        self, path: Path, sheet_name: str | int = 0, **kwargs
+    ) -> pd.DataFrame:
+        """读取单个工作表, 参数同 pd.read_excel
+
+        Args:
+            path (Path): 工作簿路径
+            sheet_name (str | int, optional): 工作表名称或序号. Defaults to 0.
+
+        Returns:
+            pd.DataFrame: 数据表
+        """
+
+        return self.read_sheets(path, {sheet_name: kwargs})[sheet_name]
+
+    def match_files(
+        self,
+        path_list: list[Path],
+        patterns: dict[str, str],
+        required: list[str] | None = None,
+    ) -> dict[str, Path]:
+        """按文件名中包含的关键字匹配输入文件
+
+        Args:
+            path_list (list[Path]): 文件路径
+            patterns (dict[str, str]): 文件键 -> 文件名关键字
+            required (list[str] | None, optional): 必须匹配到的文件键, None 时全部必须. Defaults to None.
+
+        Returns:
+            dict[str, Path]: 文件键 -> 文件路径
+        """
+
+        required = list(patterns) if required is None else required
+        res_dict: dict[str, Path] = dict()
+
+        for key, pattern in patterns.items():
+            # 忽略 Excel 打开文件时生成的临时文件
+            matched: list[Path] = [
+                p
+                for p in path_list
+                if pattern in p.name and not p.name.startswith("~$")
+            ]
+            if len(matched) > 1:
+                self.logger.error(
+                    f"文件名包含 '{pattern}' 的文件不止一个: {[p.name for p in matched]}"
+                )
+                raise ValueError()
+            if matched:
+                res_dict[key] = matched[0]
+
+        missing: list[str] = [patterns[key] for key in required if key not in res_dict]
+        if missing:
+            self.logger.error(
+                f"没有找到文件名包含 {missing} 的文件, "
+                f"读取到的文件: {[p.name for p in path_list]}"
+            )
+            raise ValueError()
+
+        return res_dict
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """清空进程内缓存"""
+
+        cls.__cache.clear()
@@ -1,6 +1,72 @@
-from .CsvConversion import ExcelToCsv
-from .FilePathReading import PathReading
-from .LogConfig import LogConfig
+import importlib
+import sys
+import types
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .CsvConversion import ExcelToCsv
+    from .DataConversion import DataCvs
+    from .FilePathReading import PathReading
+    from .LogConfig import LogConfig
+    from .ExcelExport import ExcelExport
+    from .TimeParsing import TimeParsing
+    from .TaotianStandard import TaotianStandard
+    from .CityCenterIndex import CityCenterIndex
+    from .WorkbookLoader import WorkbookLoader
+    from .StageProfiler import StageProfiler
+    from .DtypeOptimize import DtypeOptimize
+    from .KeyIndex import KeyIndex
+    from .FilePrefetch import BackgroundWriter, FilePrefetcher
+    from .FrameCache import FrameCache
 
 __version__ = "1.0.0"
 
+# 导出的类及其所在模块, 首次访问时才导入模块, 避免 `import Package` 时加载 pandas 等重量级依赖
+_exports: dict[str, str] = {
+    "ExcelToCsv": "CsvConversion",
+    "DataCvs": "DataConversion",
+    "PathReading": "FilePathReading",
+    "LogConfig": "LogConfig",
+    "ExcelExport": "ExcelExport",
+    "TimeParsing": "TimeParsing",
+    "TaotianStandard": "TaotianStandard",
+    "CityCenterIndex": "CityCenterIndex",
+    "WorkbookLoader": "WorkbookLoader",
+    "StageProfiler": "StageProfiler",
+    "DtypeOptimize": "DtypeOptimize",
+    "KeyIndex": "KeyIndex",
+    "FilePrefetcher": "FilePrefetch",
+    "BackgroundWriter": "FilePrefetch",
+    "FrameCache": "FrameCache",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value: Any = getattr(importlib.import_module(f".{_exports[name]}", __name__), name)
+    # 缓存到模块命名空间, 之后的访问不再经过 __getattr__
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
+
+
+class _LazyModule(types.ModuleType):
+    """导入子模块时, 导入系统会把子模块设置为包的同名属性(如 Package.LogConfig),
+    这里忽略这一步, 保证包属性始终是同名的类, 与原先 `from .LogConfig import LogConfig` 一致"""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _exports and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
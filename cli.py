@@ -0,0 +1,436 @@
+import sys
+import argparse
+import logging
+from datetime import date
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from Package.LogConfig import LogConfig
+
+# 退出码: 0 成功, 1 运行失败, 2 参数错误(argparse 默认)
+EXIT_OK: int = 0
+EXIT_FAILED: int = 1
+
+
+def run_convert(args: argparse.Namespace) -> int:
+    """数据格式转换"""
+
+    logger: logging.Logger = logging.getLogger(args.project_name)
+    method: str = "dir" if args.input.is_dir() else "file"
+
+    # xlsx 转 csv 使用流式转换, 支持输出文件夹和多进程
+    if args.source == "xlsx" and args.target == "csv":
+        from Package.CsvConversion import ExcelToCsv
+
+        # 单个文件指定了输出文件夹时按 dir 模式保存到该文件夹
+        exceltocsv = ExcelToCsv(
+            project_name=args.project_name,
+            method="dir" if args.output_dir is not None else method,
+            workers=args.workers,
+            cache=not args.no_cache,
+            prefetch_mb=args.prefetch_mb,
+        )
+        if method == "dir":
+            output_dir: Path = args.output_dir or args.input
+            output_dir.mkdir(parents=True, exist_ok=True)
+            res_list: list[Path] = exceltocsv.convert_dir(args.input, output_dir)
+            if exceltocsv.failed:
+                logger.error(f"{len(exceltocsv.failed)} 个文件转换失败")
+                return EXIT_FAILED
+        else:
+            if args.output_dir is not None:
+                args.output_dir.mkdir(parents=True, exist_ok=True)
+            csv_path = exceltocsv.to_csv(args.input, output_dir=args.output_dir)
+            res_list = [csv_path] if csv_path else []
+
+    else:
+        from Package.DataConversion import DataCvs
+
+        datacvs = DataCvs(
+            project_name=args.project_name,
+            method=method,
+            cache=not args.no_cache,
+            prefetch_mb=args.prefetch_mb,
+            compression=args.compression,
+            row_group_size=args.row_group_size,
+            column_types=dict(args.column_types or []),
+        )
+        res_list = datacvs.convert(args.input, dtype=args.source, cvsdtype=args.target)
+
+    if not res_list:
+        logger.error(f"'{args.input}' 没有得到转换后的文件")
+        return EXIT_FAILED
+    logger.info(f"得到 {len(res_list)} 个文件")
+
+    return EXIT_OK
+
+
+def run_ingest(args: argparse.Namespace) -> int:
+    """源数据写入 Parquet 数据仓库"""
+
+    from Package.DataConversion import DataCvs
+    from Package.ParquetStore import ParquetStore
+
+    method: str = "dir" if args.input.is_dir() else "file"
+    datacvs = DataCvs(
+        project_name=args.project_name, method=method, cache=not args.no_cache
+    )
+    store = ParquetStore(args.store, project_name=args.project_name)
+    datacvs.ingest(
+        args.input, store, args.report, dtype=args.source, date_col=args.date_col
+    )
+
+    return EXIT_OK
+
+
+def run_center(args: argparse.Namespace) -> int:
+    """中心各时段交件量表格"""
+
+    from CenterSubmission.centersubmission import CenterSubmission
+    from Package.ExcelExport import ExcelExport
+    from Package.FilePathReading import PathReading
+
+    logger: logging.Logger = logging.getLogger(args.project_name)
+    production = CenterSubmission(
+        engine=args.engine,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        prefetch_mb=args.prefetch_mb,
+        cache_dir=args.cache_dir,
+    )
+
+    if args.convert:
+        from Package.CsvConversion import ExcelToCsv
+
+        csv_dir: Path = args.csv_dir or args.input
+        csv_dir.mkdir(parents=True, exist_ok=True)
+        exceltocsv = ExcelToCsv(
+            project_name=args.project_name,
+            workers=args.workers,
+            prefetch_mb=production.prefetch_mb,
+        )
+        csv_list: list[Path] = exceltocsv.convert_dir(args.input, csv_dir)
+        # 有文件转换失败时不计算, 避免得到缺少部分数据的结果
+        if exceltocsv.failed:
+            logger.error(f"{len(exceltocsv.failed)} 个文件转换失败, 不计算交件量表格")
+            return EXIT_FAILED
+    else:
+        pathreading = PathReading(project_name=args.project_name, method="csv")
+        csv_list = pathreading.path_reading(
+            args.input,
+            include=args.include,
+            exclude=args.exclude,
+            start=args.start,
+            end=args.end,
+        )
+
+    if not csv_list:
+        logger.error(f"'{args.input}' 中没有可计算的数据文件")
+        return EXIT_FAILED
+
+    if args.state_dir is None:
+        df_multi = production.rooling_calculate(sorted(csv_list))
+    else:
+        df_multi = production.incremental_calculate(
+            args.state_dir, sorted(csv_list), window_days=args.window_days
+        )
+    ExcelExport(args.project_name).to_excel(df_multi, args.output)
+    logger.info(f"结果已保存: {args.output}")
+
+    return EXIT_OK
+
+
+def run_hqdaily(args: argparse.Namespace) -> int:
+    """总部日报报表"""
+
+    from HeadquartersDaily.HqDaily import HeadquartersDaily
+    from Package.ExcelExport import ExcelExport
+    from Package.FilePathReading import PathReading
+
+    logger: logging.Logger = logging.getLogger(args.project_name)
+    pathreading = PathReading(project_name=args.project_name, method="excel")
+    path_list: list[Path] = pathreading.path_reading(args.input)
+
+    report = HeadquartersDaily(cache_dir=args.cache_dir).report_production(path_list)
+    ExcelExport(args.project_name).to_excel(report, args.output)
+    logger.info(f"结果已保存: {args.output}")
+
+    return EXIT_OK
+
+
+def existing_path(value: str) -> Path:
+    """argparse 参数类型: 已存在的文件/文件夹路径"""
+
+    path: Path = Path(value.strip().strip("'").strip('"'))
+    if not path.exists():
+        raise argparse.ArgumentTypeError(f"路径不存在: {path}")
+
+    return path
+
+
+def iso_date(value: str) -> date:
+    """argparse 参数类型: YYYY-MM-DD 格式的日期"""
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD: {value}")
+
+
+def non_negative_int(value: str) -> int:
+    """argparse 参数类型: 非负整数"""
+
+    try:
+        number: int = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"应为整数: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"应为非负整数: {value}")
+
+    return number
+
+
+def positive_int(value: str) -> int:
+    """argparse 参数类型: 正整数"""
+
+    number: int = non_negative_int(value)
+    if number == 0:
+        raise argparse.ArgumentTypeError(f"应为正整数: {value}")
+
+    return number
+
+
+def column_type(value: str) -> tuple[str, str]:
+    """argparse 参数类型: 列名=类型, 例如 揽收网点代码=string"""
+
+    col, sep, col_type = value.rpartition("=")
+    if not sep or not col or not col_type:
+        raise argparse.ArgumentTypeError(f"列类型格式应为 列名=类型: {value}")
+
+    return col, col_type
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """命令行参数"""
+
+    dtype: list[str] = ["xlsx", "csv", "parquet"]
+
+    parser = argparse.ArgumentParser(description="时效报表脚本的命令行入口")
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="日志级别",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=Path,
+        default=None,
+        help="日志文件路径, 默认为 ./logs/项目名称.log",
+    )
+    parser.add_argument(
+        "--log-max-bytes",
+        type=positive_int,
+        default=512 * 1024,
+        help="单个日志文件的最大字节数",
+    )
+    parser.add_argument(
+        "--queue-log",
+        action="store_true",
+        help="在后台线程中写日志, 子进程的日志转发到主进程",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # --数据格式转换--
+    convert = subparsers.add_parser("convert", help="数据格式转换")
+    convert.add_argument("input", type=existing_path, help="待转换的文件/文件夹路径")
+    convert.add_argument(
+        "--from", dest="source", choices=dtype, default="xlsx", help="待转换格式"
+    )
+    convert.add_argument(
+        "--to", dest="target", choices=dtype, default="csv", help="转换后格式"
+    )
+    convert.add_argument(
+        "--output-dir",
+        type=Path,
+        default=None,
+        help="xlsx转csv时保存csv的文件夹, 默认与源文件相同",
+    )
+    convert.add_argument(
+        "--workers",
+        type=non_negative_int,
+        default=1,
+        help="并行转换的进程数, 0 为CPU核数",
+    )
+    convert.add_argument("--no-cache", action="store_true", help="不跳过未变化的文件")
+    convert.add_argument(
+        "--prefetch-mb",
+        type=non_negative_int,
+        default=256,
+        help="预读后续文件和排队写入的内存上限(MB), 0 为不预读",
+    )
+    convert.add_argument(
+        "--compression",
+        choices=["snappy", "gzip", "brotli", "zstd", "lz4", "none"],
+        default="snappy",
+        help="转换为parquet时的压缩格式",
+    )
+    convert.add_argument(
+        "--row-group-size",
+        type=positive_int,
+        default=250_000,
+        help="转换为parquet时每个行组的行数",
+    )
+    convert.add_argument(
+        "--column-types",
+        type=column_type,
+        nargs="+",
+        default=None,
+        help="csv转parquet时指定的列类型, 格式为 列名=类型, 例如 揽收网点代码=string",
+    )
+    convert.set_defaults(func=run_convert, project_name="Conversion")
+
+    # --写入数据仓库--
+    ingest = subparsers.add_parser("ingest", help="源数据写入 Parquet 数据仓库")
+    ingest.add_argument("input", type=existing_path, help="源数据文件/文件夹路径")
+    ingest.add_argument("--store", type=Path, required=True, help="数据仓库根目录")
+    ingest.add_argument(
+        "--report", required=True, help="报表类型, 例如 CenterSubmission"
+    )
+    ingest.add_argument(
+        "--from", dest="source", choices=dtype, default="csv", help="源数据格式"
+    )
+    ingest.add_argument(
+        "--date-col", default=None, help="按该列拆分日期分区, 默认从文件名识别日期"
+    )
+    ingest.add_argument("--no-cache", action="store_true", help="不跳过未变化的文件")
+    ingest.set_defaults(func=run_ingest, project_name="Conversion")
+
+    # --中心各时段交件量--
+    center = subparsers.add_parser("center", help="中心各时段交件量表格")
+    center.add_argument("input", type=existing_path, help="数据文件夹路径")
+    center.add_argument("--output", type=Path, required=True, help="结果xlsx文件路径")
+    center.add_argument(
+        "--convert", action="store_true", help="先将文件夹中的xlsx转换为csv"
+    )
+    center.add_argument(
+        "--csv-dir",
+        type=Path,
+        default=None,
+        help="转换后csv的保存文件夹, 默认与源文件相同",
+    )
+    center.add_argument(
+        "--workers",
+        type=non_negative_int,
+        default=1,
+        help="并行计算的进程数, 0 为CPU核数",
+    )
+    center.add_argument(
+        "--engine", choices=["c", "pyarrow"], default=None, help="csv解析引擎"
+    )
+    center.add_argument(
+        "--chunksize",
+        type=positive_int,
+        default=None,
+        help="分块读取的行数, 用于超过内存的大文件",
+    )
+    center.add_argument(
+        "--state-dir",
+        type=Path,
+        default=None,
+        help="增量计算的计数状态文件夹, 只计算新增或变化的文件",
+    )
+    center.add_argument(
+        "--window-days",
+        type=positive_int,
+        default=None,
+        help="增量计算时保留的最近天数",
+    )
+    center.add_argument(
+        "--include", nargs="+", default=None, help="只计算文件名匹配这些通配符的文件"
+    )
+    center.add_argument(
+        "--exclude", nargs="+", default=None, help="排除文件名匹配这些通配符的文件"
+    )
+    center.add_argument(
+        "--start",
+        type=iso_date,
+        default=None,
+        help="只计算文件名日期不早于该日期的文件",
+    )
+    center.add_argument(
+        "--end", type=iso_date, default=None, help="只计算文件名日期不晚于该日期的文件"
+    )
+    center.add_argument(
+        "--prefetch-mb",
+        type=non_negative_int,
+        default=None,
+        help="串行计算时预读后续文件的内存上限(MB), 0 为不预读, 默认使用配置值",
+    )
+    center.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="单日表的缓存文件夹, 文件未变化时直接读取缓存",
+    )
+    center.set_defaults(func=run_center, project_name="CenterSubmission")
+
+    # --总部日报--
+    hqdaily = subparsers.add_parser("hqdaily", help="总部日报报表")
+    hqdaily.add_argument(
+        "input", type=existing_path, help="GPT和城市线路汇总文件所在的文件夹"
+    )
+    hqdaily.add_argument("--output", type=Path, required=True, help="结果xlsx文件路径")
+    hqdaily.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="中间结果的缓存文件夹, 输入文件未变化时直接读取缓存",
+    )
+    hqdaily.set_defaults(func=run_hqdaily, project_name="HeadquartersDaily")
+
+    return parser
+
+
+def check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """检验参数之间的组合, 不合法时按参数错误退出"""
+
+    if args.command == "convert":
+        if args.source == args.target:
+            parser.error(f"--from 和 --to 不能相同: {args.source}")
+        xlsx_to_csv: bool = args.source == "xlsx" and args.target == "csv"
+        if args.output_dir is not None and not xlsx_to_csv:
+            parser.error("--output-dir 只用于 xlsx 转 csv")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser: argparse.ArgumentParser = build_parser()
+    args: argparse.Namespace = parser.parse_args(argv)
+    check_args(parser, args)
+
+    logconfig = LogConfig(
+        args.project_name,
+        level=args.log_level,
+        log_file=args.log_file,
+        max_bytes=args.log_max_bytes,
+        queue=args.queue_log,
+    )
+    logger: logging.Logger = logconfig.setup_logger()
+    logger.info(f"--{args.command} 开始--")
+
+    try:
+        code: int = args.func(args)
+    except Exception:
+        logger.exception(f"--{args.command} 运行失败--")
+        return EXIT_FAILED
+    else:
+        logger.info(f"--{args.command} 结束--")
+        return code
+    finally:
+        # 队列模式下写完剩余的日志
+        LogConfig.stop(args.project_name)
+
+
+if __name__ == "__main__":
+    sys.exit(main())